@@ -3,6 +3,7 @@
 # ===========================================
 
 import os
+import json
 import time
 import shutil
 import glob
@@ -55,6 +56,16 @@ excluded_modules = [
     "PySide6.QtNfc", "PySide6.QtPrintSupport",
 ]
 
+# --- Bake config/languages.json into a module (frozen fallback, no JSON parse) ---
+if os.path.isfile(os.path.join("config", "languages.json")):
+    with open(os.path.join("config", "languages.json"), "r", encoding="utf-8") as f:
+        langs = json.load(f)
+    with open("languages_frozen.py", "w", encoding="utf-8") as f:
+        f.write("# Generated by build_macos.spec from config/languages.json; do not edit.\n")
+        f.write(f"LANGS = {langs!r}\n")
+    hiddenimports.append("languages_frozen")
+    print("🧩 Generated languages_frozen.py")
+
 # --- Clean old build/dist ---
 for d in ["build", "dist"]:
     if os.path.exists(d):
@@ -3,29 +3,36 @@
 # ================================
 import sys, json, subprocess
 from pathlib import Path
-from typing import Dict
 
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtWidgets import QMainWindow, QApplication, QTabWidget, QMessageBox, QFileDialog, QDialog
 
 # Local imports
 from prefs import PreferencesDialog
-from utils import SettingsManager, FFMPEG, FFPROBE, YTDLP, load_languages
+from utils import SettingsManager, FFMPEG, FFPROBE, YTDLP, load_languages, tool_present
 from tabs.download import DownloadTab
-from tabs.mux import MuxTab
-from tabs.demux import DemuxTab
+# MuxTab / DemuxTab are imported lazily on first visit (see _ensure_tab_loaded)
 
 if sys.platform == "win32":
-    old_popen = subprocess.Popen
-
-    def silent_popen(*args, **kwargs):
-        # Always apply no-window flags unless overridden
-        kwargs["startupinfo"] = kwargs.get("startupinfo") or subprocess.STARTUPINFO()
-        kwargs["startupinfo"].dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        kwargs["creationflags"] = kwargs.get("creationflags", 0) | subprocess.CREATE_NO_WINDOW
-        return old_popen(*args, **kwargs)
-
-    subprocess.Popen = silent_popen
+    class SilentPopen(subprocess.Popen):
+        """Popen that never opens a console window for child processes."""
+        # Shared default; Popen copies startupinfo before using it
+        _STARTUPINFO = subprocess.STARTUPINFO()
+        _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        def __init__(self, *args, startupinfo=None, creationflags=0, **kwargs):
+            if startupinfo is None:
+                startupinfo = self._STARTUPINFO
+            else:
+                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            super().__init__(*args, startupinfo=startupinfo,
+                             creationflags=creationflags | subprocess.CREATE_NO_WINDOW, **kwargs)
+
+    subprocess.Popen = SilentPopen
+
+# Status bar lookups (policies come from a fixed set)
+_POL_CAP = {"safe": "Safe", "overwrite": "Overwrite"}
+_TAB_KEYS = {"Download": "download", "Mux": "mux", "Demux": "demux"}
 
 class MainWindow(QMainWindow):
     settings_changed = QtCore.Signal()
@@ -47,31 +54,59 @@ class MainWindow(QMainWindow):
         # Tabs
         self.tabs = QTabWidget()
         self.tab_download = DownloadTab(self.settings)
-        self.tab_mux = MuxTab(self.settings)
-        self.tab_demux = DemuxTab(self.settings)
+        self.tab_mux = None     # built on first activation
+        self.tab_demux = None   # built on first activation
         self.tabs.addTab(self.tab_download, "Download")
-        self.tabs.addTab(self.tab_mux, "Mux")
-        self.tabs.addTab(self.tab_demux, "Demux")
+        self.tabs.addTab(QtWidgets.QWidget(), "Mux")
+        self.tabs.addTab(QtWidgets.QWidget(), "Demux")
         self.setCentralWidget(self.tabs)
 
         # Menu bar
         self._build_menu()
 
-        # Status bar (read-only)
+        # Status bar (read-only); updates are coalesced to one per event-loop turn
         self.status = self.statusBar()
-        self._update_status_bar()
+        self._status_timer = QtCore.QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.timeout.connect(self._do_update_status_bar)
+        # First paint of the status text happens once the event loop runs (after show())
+        QtCore.QTimer.singleShot(0, self._do_update_status_bar)
 
         # Wire updates
+        self.tabs.currentChanged.connect(self._ensure_tab_loaded)
         self.tabs.currentChanged.connect(self._update_status_bar)
         self.settings_changed.connect(self._update_status_bar)
         # Tabs can emit when output dir changes
         self.tab_download.output_dir_changed.connect(self._update_status_bar)
-        # self.tab_mux.output_dir_changed.connect(self._update_status_bar)
-        #self.tab_demux.output_dir_changed.connect(self._update_status_bar)
-        if hasattr(self.tab_mux, "output_dir_changed"):
-            self.tab_mux.output_dir_changed.connect(self._update_status_bar)
-        if hasattr(self.tab_demux, "output_dir_changed"):
-            self.tab_demux.output_dir_changed.connect(self._update_status_bar)
+
+    # ---- Lazy tabs ----
+    def _ensure_tab_loaded(self, idx: int):
+        """Import and build the Mux/Demux tab the first time it is selected."""
+        name = self.tabs.tabText(idx)
+        if name == "Mux" and self.tab_mux is None:
+            from tabs.mux import MuxTab
+            self.tab_mux = MuxTab(self.settings)
+            self._swap_in_tab(idx, self.tab_mux, name)
+        elif name == "Demux" and self.tab_demux is None:
+            from tabs.demux import DemuxTab
+            self.tab_demux = DemuxTab(self.settings)
+            self._swap_in_tab(idx, self.tab_demux, name)
+
+    def _swap_in_tab(self, idx: int, widget: QtWidgets.QWidget, name: str):
+        placeholder = self.tabs.widget(idx)
+        # removeTab() would select a neighbour and re-enter _ensure_tab_loaded
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(idx)
+        self.tabs.insertTab(idx, widget, name)
+        self.tabs.setCurrentIndex(idx)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        if hasattr(widget, "output_dir_changed"):
+            widget.output_dir_changed.connect(self._update_status_bar)
+
+    def loaded_tabs(self):
+        """Tabs that have actually been constructed."""
+        return [t for t in (self.tab_download, self.tab_mux, self.tab_demux) if t is not None]
 
     # ---- Menu ----
     def _build_menu(self):
@@ -79,6 +114,8 @@ class MainWindow(QMainWindow):
         file_menu = menubar.addMenu("&File")
         act_prefs = file_menu.addAction("Preferences…")
         act_prefs.triggered.connect(self.open_prefs)
+        act_clear_cache = file_menu.addAction("Clear Metadata Cache")
+        act_clear_cache.triggered.connect(self.tab_download.clear_metadata_cache)
         file_menu.addSeparator()
         act_exit = file_menu.addAction("Exit")
         act_exit.triggered.connect(self.close)
@@ -89,14 +126,18 @@ class MainWindow(QMainWindow):
 
     def open_prefs(self):
         dlg = PreferencesDialog(self.settings, self)
-        if dlg.exec() == QDialog.Accepted:   # ✅ correct
-            self.settings.save()
+        if dlg.exec() == QDialog.Accepted:   # ✅ correct (dialog already saved)
             # push updates to tabs
-            self.tab_download.refresh_settings()
-            self.tab_mux.refresh_settings()
-            self.tab_demux.refresh_settings()
+            for tab in self.loaded_tabs():
+                tab.refresh_settings()
             self.settings_changed.emit()
 
+    def closeEvent(self, event):
+        # Stop workers and child processes before Qt tears the widgets down
+        for tab in self.loaded_tabs():
+            tab.cleanup_on_exit()
+        super().closeEvent(event)
+
     def about(self):
         QMessageBox.information(self, "About WebTvMux",
             "WebTvMux — downloader, muxer, and demuxer for media files.\n"
@@ -104,14 +145,15 @@ class MainWindow(QMainWindow):
             "Status bar shows per-tab overwrite policy and output directory.")
 
     # ---- Status bar text ----
-    def _update_status_bar(self):
+    def _update_status_bar(self, *_):
+        self._status_timer.start(0)
+
+    def _do_update_status_bar(self):
         idx = self.tabs.currentIndex()
         tab_name = self.tabs.tabText(idx)
-        policies: Dict[str, str] = self.settings.data.get("overwrite_policy", {})
-        last_out_dirs: Dict[str, str] = self.settings.data.get("last_output_dir", {})
-        key = tab_name.lower()
-        pol = policies.get(key, "safe").capitalize()
-        out_dir = last_out_dirs.get(key, str(Path.cwd()))
+        key = _TAB_KEYS.get(tab_name) or tab_name.lower()
+        pol = _POL_CAP.get(self.settings._policies.get(key, "safe"), "Safe")
+        out_dir = self.settings._out_dirs.get(key) or str(Path.cwd())
         self.status.showMessage(f"{tab_name} overwrite policy: {pol} | Output dir: {out_dir}")
 
 
@@ -119,22 +161,24 @@ def main():
     QtWidgets.QApplication.setHighDpiScaleFactorRoundingPolicy(
         QtCore.Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
     )
+    # QSettings() picks its storage location from these
+    QtCore.QCoreApplication.setOrganizationName("WebTvMux")
+    QtCore.QCoreApplication.setApplicationName("WebTvMux")
     app = QApplication(sys.argv)
 
     # --- Sanity check for missing runtime files ---
-    from pathlib import Path
     missing = []
     for name, path in [
         ("ffmpeg", FFMPEG),
         ("ffprobe", FFPROBE),
         ("yt-dlp", YTDLP),
     ]:
-        if not Path(path).exists():
+        # same cached rule as verify_tools(): bin/ listing, stat, or PATH
+        if not tool_present(path):
             missing.append(f"bin/{name}.exe")
 
-    from utils import load_languages
-    lang_data = load_languages()
-    if not lang_data:
+    # load_languages() is cached, so the tabs reuse this parse
+    if not load_languages():
         missing.append("config/languages.json")
 
     if missing:
@@ -147,10 +191,7 @@ def main():
     w = MainWindow()
     w.show()
 
-    # 🔑 Cleanup all workers on app exit
-    app.aboutToQuit.connect(w.tab_download.cleanup_on_exit)
-    app.aboutToQuit.connect(w.tab_mux.cleanup_on_exit)
-    app.aboutToQuit.connect(w.tab_demux.cleanup_on_exit)
+    # Workers are cleaned up in MainWindow.closeEvent
     sys.exit(app.exec())
 
 
@@ -1,66 +1,65 @@
+from functools import partial
 from pathlib import Path
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QComboBox, QFileDialog, QMessageBox
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPushButton,
+    QComboBox, QFileDialog, QMessageBox, QWidget
 )
-from utils import SettingsManager, DEFAULT_SETTINGS
+from PySide6.QtCore import QTimer
+from utils import SettingsManager
 import sys
 INSTALL_DIR = str(Path(sys.argv[0]).resolve().parent)
 
+# (settings key, label, past participle used in tooltips)
+_SECTIONS = [
+    ("download", "Download", "downloaded"),
+    ("mux", "Mux", "muxed"),
+    ("demux", "Demux", "demuxed"),
+]
+
+_POLICY_TOOLTIP = (
+    "{label} overwrite policy:\n"
+    "• safe = avoid overwriting files (auto-rename if needed)\n"
+    "• overwrite = replace existing files"
+)
+
+def _row_widget(*widgets) -> QWidget:
+    """Pack widgets side by side into one QWidget for a QFormLayout field."""
+    w = QWidget()
+    row = QHBoxLayout(w)
+    row.setContentsMargins(0, 0, 0, 0)
+    for child in widgets:
+        row.addWidget(child)
+    return w
+
 class PreferencesDialog(QDialog):
     def __init__(self, settings: SettingsManager, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Preferences")
         self.settings = settings
-
-        # --- Policies ---
-        self.dl_policy = QComboBox()
-        self.dl_policy.addItems(["safe", "overwrite"])
-        self.dl_policy.setToolTip(
-            "Download overwrite policy:\n"
-            "• safe = avoid overwriting files (auto-rename if needed)\n"
-            "• overwrite = replace existing files"
-        )
-
-        self.mux_policy = QComboBox()
-        self.mux_policy.addItems(["safe", "overwrite"])
-        self.mux_policy.setToolTip(
-            "Mux overwrite policy:\n"
-            "• safe = avoid overwriting files (auto-rename if needed)\n"
-            "• overwrite = replace existing files"
-        )
-
-        self.demux_policy = QComboBox()
-        self.demux_policy.addItems(["safe", "overwrite"])
-        self.demux_policy.setToolTip(
-            "Demux overwrite policy:\n"
-            "• safe = avoid overwriting files (auto-rename if needed)\n"
-            "• overwrite = replace existing files"
-        )
-
-        # --- Directories ---
-        self.dl_dir = QLineEdit()
-        self.dl_dir.setToolTip("Path to save downloaded files (hover to see full path)")
-        self.mux_dir = QLineEdit()
-        self.mux_dir.setToolTip("Path to save muxed files (hover to see full path)")
-        self.demux_dir = QLineEdit()
-        self.demux_dir.setToolTip("Path to save demuxed files (hover to see full path)")
-
-        # Browse buttons
-        b1 = QPushButton("Browse")
-        b1.setToolTip("Select download output directory")
-        b2 = QPushButton("Browse")
-        b2.setToolTip("Select mux output directory")
-        b3 = QPushButton("Browse")
-        b3.setToolTip("Select demux output directory")
-
-        # Restore buttons
-        self.restore_dl_btn = QPushButton("Restore")
-        self.restore_dl_btn.setToolTip("Restore the last used download directory")
-        self.restore_mux_btn = QPushButton("Restore")
-        self.restore_mux_btn.setToolTip("Restore the last used mux directory")
-        self.restore_demux_btn = QPushButton("Restore")
-        self.restore_demux_btn.setToolTip("Restore the last used demux directory")
+        self._default_path = str(Path.cwd())  # fallback when no dir is saved
+
+        # --- Per-tab policy combo, dir edit, browse + restore buttons ---
+        self._policy = {}
+        self._dir = {}
+        self._browse = {}
+        self._restore = {}
+        for key, label, done in _SECTIONS:
+            combo = QComboBox()
+            combo.addItems(["safe", "overwrite"])
+            combo.setToolTip(_POLICY_TOOLTIP.format(label=label))
+            self._policy[key] = combo
+
+            edit = QLineEdit()
+            edit.setToolTip(f"Path to save {done} files (hover to see full path)")
+            self._dir[key] = edit
+
+            browse = QPushButton("Browse")
+            browse.setToolTip(f"Select {key} output directory")
+            self._browse[key] = browse
+
+            restore = QPushButton("Restore")
+            restore.setToolTip(f"Restore the last used {key} directory")
+            self._restore[key] = restore
 
         # --- Buttons ---
         self.reset_btn = QPushButton("Reset to Defaults")
@@ -72,30 +71,18 @@ class PreferencesDialog(QDialog):
 
         # --- Layout ---
         layout = QVBoxLayout()
+        form = QFormLayout()
 
         # Policies
-        for title, widget in [
-            ("Download overwrite policy", self.dl_policy),
-            ("Mux overwrite policy", self.mux_policy),
-            ("Demux overwrite policy", self.demux_policy),
-        ]:
-            row = QHBoxLayout()
-            row.addWidget(QLabel(title))
-            row.addWidget(widget)
-            layout.addLayout(row)
+        for key, label, _ in _SECTIONS:
+            form.addRow(f"{label} overwrite policy", self._policy[key])
 
         # Dirs
-        for title, edit, browse_btn, restore_btn in [
-            ("Download output dir", self.dl_dir, b1, self.restore_dl_btn),
-            ("Mux output dir", self.mux_dir, b2, self.restore_mux_btn),
-            ("Demux output dir", self.demux_dir, b3, self.restore_demux_btn),
-        ]:
-            row = QHBoxLayout()
-            row.addWidget(QLabel(title))
-            row.addWidget(edit)
-            row.addWidget(browse_btn)
-            row.addWidget(restore_btn)
-            layout.addLayout(row)
+        for key, label, _ in _SECTIONS:
+            form.addRow(f"{label} output dir",
+                        _row_widget(self._dir[key], self._browse[key], self._restore[key]))
+
+        layout.addLayout(form)
 
         # Action buttons
         buttons = QHBoxLayout()
@@ -112,67 +99,62 @@ class PreferencesDialog(QDialog):
         self.ok_btn.clicked.connect(self.accept_and_save)
         self.cancel_btn.clicked.connect(self.reject)
 
-        b1.clicked.connect(lambda: self._pick_dir(self.dl_dir, "download", self.restore_dl_btn))
-        b2.clicked.connect(lambda: self._pick_dir(self.mux_dir, "mux", self.restore_mux_btn))
-        b3.clicked.connect(lambda: self._pick_dir(self.demux_dir, "demux", self.restore_demux_btn))
-
-        self.restore_dl_btn.clicked.connect(lambda: self._restore_dir("download", self.dl_dir, self.restore_dl_btn))
-        self.restore_mux_btn.clicked.connect(lambda: self._restore_dir("mux", self.mux_dir, self.restore_mux_btn))
-        self.restore_demux_btn.clicked.connect(lambda: self._restore_dir("demux", self.demux_dir, self.restore_demux_btn))
+        # Debounce restore-button checks: bursts of keystrokes/pastes run one check per key
+        self._pending_keys = set()
+        self._restore_check_timer = QTimer(self)
+        self._restore_check_timer.setSingleShot(True)
+        self._restore_check_timer.setInterval(50)
+        self._restore_check_timer.timeout.connect(self._flush_restore_checks)
 
-        self.dl_dir.textChanged.connect(lambda: self._check_restore_button("download", self.dl_dir, self.restore_dl_btn))
-        self.mux_dir.textChanged.connect(lambda: self._check_restore_button("mux", self.mux_dir, self.restore_mux_btn))
-        self.demux_dir.textChanged.connect(lambda: self._check_restore_button("demux", self.demux_dir, self.restore_demux_btn))
+        for key, _, _ in _SECTIONS:
+            self._browse[key].clicked.connect(partial(self._pick_dir, key))
+            self._restore[key].clicked.connect(partial(self._restore_dir, key))
+            self._dir[key].textChanged.connect(partial(self._queue_restore_check, key))
 
         # Load settings into UI
         self._load_into_ui()
 
     # --- Helpers ---
-    def _pick_dir(self, edit: QLineEdit, key: str, btn: QPushButton):
+    # Slots take *_ so partial() stays safe when Qt passes signal arguments.
+    def _pick_dir(self, key: str, *_):
         d = QFileDialog.getExistingDirectory(self, "Select folder")
         if d:
+            edit = self._dir[key]
             edit.setText(d)
             edit.setToolTip(f"{key.capitalize()} output directory:\n{d}")
-            self._check_restore_button(key, edit, btn)
+            self._check_restore_button(key)
 
-    def _restore_dir(self, key: str, widget: QLineEdit, btn: QPushButton):
-        lod = self.settings.data.get("last_output_dir", {})
-        default_path = str(Path.cwd())
-        saved_path = lod.get(key, default_path)
+    def _restore_dir(self, key: str, *_):
+        saved_path = self.settings._out_dirs.get(key) or self._default_path
+        widget = self._dir[key]
         widget.setText(saved_path)
         widget.setToolTip(f"{key.capitalize()} output directory:\n{saved_path}")
-        btn.setEnabled(False)
-
-    def _check_restore_button(self, key: str, widget: QLineEdit, btn: QPushButton):
-        lod = self.settings.data.get("last_output_dir", {})
-        default_path = str(Path.cwd())
-        saved_path = lod.get(key, default_path)
-        btn.setEnabled(widget.text() != saved_path)
+        self._restore[key].setEnabled(False)
 
-    def _load_into_ui(self):
-        pol = self.settings.data.get("overwrite_policy", {})
-        self.dl_policy.setCurrentText(pol.get("download", "safe"))
-        self.mux_policy.setCurrentText(pol.get("mux", "safe"))
-        self.demux_policy.setCurrentText(pol.get("demux", "safe"))
+    def _queue_restore_check(self, key: str, *_):
+        self._pending_keys.add(key)
+        self._restore_check_timer.start()
 
-        lod = self.settings.data.get("last_output_dir", {})
-        default_path = str(Path.cwd())
+    def _flush_restore_checks(self):
+        for key in self._pending_keys:
+            self._check_restore_button(key)
+        self._pending_keys.clear()
 
-        dl_path = lod.get("download", default_path)
-        mux_path = lod.get("mux", default_path)
-        demux_path = lod.get("demux", default_path)
+    def _check_restore_button(self, key: str):
+        saved_path = self.settings._out_dirs.get(key) or self._default_path
+        self._restore[key].setEnabled(self._dir[key].text() != saved_path)
 
-        self.dl_dir.setText(dl_path)
-        self.mux_dir.setText(mux_path)
-        self.demux_dir.setText(demux_path)
-
-        self.dl_dir.setToolTip(f"Download output directory:\n{dl_path}")
-        self.mux_dir.setToolTip(f"Mux output directory:\n{mux_path}")
-        self.demux_dir.setToolTip(f"Demux output directory:\n{demux_path}")
+    def _load_into_ui(self):
+        pol = self.settings.data.get("overwrite_policy", {})
+        lod = self.settings._out_dirs
+        for key, label, _ in _SECTIONS:
+            self._policy[key].setCurrentText(pol.get(key, "safe"))
 
-        self.restore_dl_btn.setEnabled(self.dl_dir.text() != dl_path)
-        self.restore_mux_btn.setEnabled(self.mux_dir.text() != mux_path)
-        self.restore_demux_btn.setEnabled(self.demux_dir.text() != demux_path)
+            path = lod.get(key, self._default_path)
+            edit = self._dir[key]
+            edit.setText(path)
+            edit.setToolTip(f"{label} output directory:\n{path}")
+            self._restore[key].setEnabled(edit.text() != path)
 
     def reset_defaults(self):
         reply = QMessageBox.question(
@@ -183,20 +165,16 @@ class PreferencesDialog(QDialog):
             QMessageBox.No,
         )
         if reply == QMessageBox.Yes:
-            self.settings.data = DEFAULT_SETTINGS.copy()
+            self.settings.reset_defaults()
             self._load_into_ui()
 
     def accept_and_save(self):
-        self.settings.data["overwrite_policy"] = {
-            "download": self.dl_policy.currentText(),
-            "mux": self.mux_policy.currentText(),
-            "demux": self.demux_policy.currentText(),
-        }
-        self.settings.data["last_output_dir"] = {
-            "download": self.dl_dir.text() or INSTALL_DIR,
-            "mux": self.mux_dir.text() or INSTALL_DIR,
-            "demux": self.demux_dir.text() or INSTALL_DIR,
-        }
-        self.settings.save()
+        for key, _, _ in _SECTIONS:
+            self.settings.set_policy(key, self._policy[key].currentText())
+        for key, _, _ in _SECTIONS:
+            self.settings.set_out_dir(key, self._dir[key].text() or INSTALL_DIR)
+        # OK without changes: nothing to write or flush
+        if self.settings.dirty:
+            self.settings.save()
+            self.settings.sync()
         self.done(QDialog.Accepted)
-
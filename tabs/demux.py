@@ -1,5 +1,8 @@
 import json, os
-import subprocess, sys
+import subprocess, sys, threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from enum import IntEnum
+from functools import partial
 from pathlib import Path
 from PySide6 import QtWidgets, QtCore
 from PySide6.QtCore import Qt
@@ -9,9 +12,15 @@ from PySide6.QtWidgets import (
     QProgressBar, QComboBox, QCheckBox, QSpinBox
 )
 
-from utils import ensure_unique_path, FFMPEG, FFPROBE
+from utils import FFMPEG, FFPROBE
+try:
+    import orjson  # optional, faster JSON parsing
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads  # also accepts bytes
 from workers import FfmpegWorker
-from utils import verify_tools
+from utils import verify_tools, terminate_process, join_thread, batched_table_updates
+from utils import cached_probe, store_probe, save_probe_cache
 verify_tools()
 
 INSTALL_DIR = str(Path(sys.argv[0]).resolve().parent)
@@ -24,70 +33,201 @@ if sys.platform == "win32":
     STARTUPINFO = subprocess.STARTUPINFO()
     STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
     
-# ---- ffprobe cache ----
-_ffprobe_cache: dict[str, dict] = {}
-
-def probe_file(path: str) -> dict:
-    for exe in (FFMPEG, FFPROBE):
-        if not os.path.exists(exe):
-            raise FileNotFoundError(
-                f"Required tool not found: {exe}\n"
-                "Make sure the 'bin' folder with ffmpeg.exe, ffprobe.exe, and yt-dlp.exe "
-                "is next to your WebTvMux.exe."
-            )
-    """Probe a media file with ffprobe and cache results in memory."""
-    if path in _ffprobe_cache:
-        return _ffprobe_cache[path]
+def probe_file(path: str, owner=None) -> dict:
+    """Probe a media file with ffprobe and cache results (persisted by save_probe_cache).
+
+    The tools are checked once by verify_tools() at import, not per probe.
+    """
+    info = cached_probe("demux", path)
+    if info is not None:
+        return info
 
     cmd = [
-        FFPROBE, "-v", "error",
+        FFPROBE, "-threads", "1",  # metadata only; files are already probed in parallel
+        "-v", "error",
         "-show_entries",
-        "format=duration:stream=index,codec_type,codec_name:stream_tags=language,title:stream_disposition=default",
+        # only fields _ProbeThread reads (no stream title)
+        "format=duration:stream=index,codec_type,codec_name:stream_tags=language:stream_disposition=default",
         "-of", "json", path
     ]
 
-    proc = subprocess.Popen(
+    # Binary pipes: the JSON parser takes bytes directly, no decode step
+    with subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
         startupinfo=STARTUPINFO,
         creationflags=CREATE_NO_WINDOW
-    )
-    out, err = proc.communicate(timeout=6)
+    ) as proc:
+        # Let the owning _ProbeThread kill this probe on stop()
+        if owner is not None:
+            owner._register_proc(proc)
+        try:
+            out, err = proc.communicate(timeout=6)  # stderr is tiny with -v error
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            if owner is not None:
+                owner._unregister_proc(proc)
     if proc.returncode != 0:
-        raise RuntimeError(f"ffprobe failed for {path}: {err.strip() or proc.returncode}")
+        err = err.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffprobe failed for {path}: {err or proc.returncode}")
 
     try:
-        info = json.loads(out or "{}")
+        info = _loads(out or b"{}")
     except Exception:
-        info = {}
-    _ffprobe_cache[path] = info
+        return {}  # not cached: a bad parse would otherwise stick until the file changes
+    store_probe("demux", path, info)
     return info
 
+class _Status(IntEnum):
+    """Row state, kept in the Status item's UserRole next to its text."""
+    PENDING = 0
+    RUNNING = 1
+    DONE = 2
+    ERROR = 3
+
+    @property
+    def label(self):
+        return self.name.capitalize()
+
+def _status_item(status):
+    item = QTableWidgetItem(status.label)
+    item.setData(Qt.UserRole, int(status))
+    return item
+
+def _row_ranges(rows):
+    """Group row indices into (first, count) runs, highest rows first."""
+    ranges = []
+    for r in sorted(set(rows), reverse=True):
+        if ranges and ranges[-1][0] == r + 1:
+            ranges[-1] = (r, ranges[-1][1] + 1)
+        else:
+            ranges.append((r, 1))
+    return ranges
+
+# audio format -> (container ext, encoder, codecs that can be stream-copied;
+# None means any pcm_* codec)
+_AUDIO_TABLE = {
+    "aac":  ("m4a",  "aac",        ("aac",)),   # m4a: safer container for AAC
+    "mp3":  ("mp3",  "libmp3lame", ("mp3",)),
+    "flac": ("flac", "flac",       ("flac",)),
+    "opus": ("opus", "libopus",    ("opus",)),
+    "wav":  ("wav",  "pcm_s16le",  None),
+}
+
+# video streams are copied only for these codecs into these containers
+_COPYABLE_VIDEO_CODECS = frozenset({"h264", "hevc"})
+_VIDEO_CONTAINERS = frozenset({"mp4", "mkv", "mov"})
+_VIDEO_SUFFIXES = (".mp4", ".mkv", ".mov")  # tuple: str.endswith() needs one
+
+def _claim_unique_path(folder: Path, name: str, taken: set) -> Path:
+    """Like ensure_unique_path, but checks a set of names already in the
+    folder or handed out this batch instead of stat'ing each candidate."""
+    stem, dot, suffix = name.rpartition(".")
+    candidate, i = name, 1
+    while os.path.normcase(candidate) in taken:
+        candidate = f"{stem} ({i}){dot}{suffix}"
+        i += 1
+    taken.add(os.path.normcase(candidate))
+    return folder / candidate
+
 class _ProbeThread(QtCore.QThread):
     done = QtCore.Signal(list, str)  # (jobs, error)
 
-    def __init__(self, files, audio_ext, video_ext, force_reencode, out_dir):
+    def __init__(self, files, audio_ext, video_ext, force_reencode, out_dir, max_parallel=1):
         super().__init__()
         self.files = files
         self.audio_ext = audio_ext
+        self._audio_cfg = _AUDIO_TABLE.get(audio_ext)  # constant for the batch
         self.video_ext = video_ext
         self.force_reencode = force_reencode
         self.out_dir = out_dir
+        # Split the cores between concurrently running ffmpeg jobs
+        self.ffmpeg_threads = max(1, (os.cpu_count() or max_parallel) // max(1, max_parallel))
         self._stopped = False
-        
+        self._procs = set()               # running ffprobe processes
+        self._procs_lock = threading.Lock()
+
     def stop(self):
-        """Signal the thread to stop gracefully"""
-        self._stopped = True
+        """Signal the thread to stop and kill any ffprobe still running"""
+        with self._procs_lock:
+            self._stopped = True
+        self._kill_probes()
+
+    def _kill_probes(self):
+        with self._procs_lock:
+            for proc in self._procs:
+                proc.kill()
+
+    def _register_proc(self, proc):
+        with self._procs_lock:
+            if self._stopped:
+                proc.kill()
+            self._procs.add(proc)
+
+    def _unregister_proc(self, proc):
+        with self._procs_lock:
+            self._procs.discard(proc)
+
+    def _derive_codec_opt(self, codec_type, codec, force_reencode):
+        """Output extension and ffmpeg codec options for one kind of stream."""
+        if codec_type == "video":
+            ext = self.video_ext
+            # allow copy only if codec is h264/h265 and container supports it
+            if (not force_reencode and codec in _COPYABLE_VIDEO_CODECS
+                    and ext in _VIDEO_CONTAINERS):
+                return ext, ["-c:v", "copy"]
+            return ext, ["-c:v", "libx264"]
+
+        if self._audio_cfg is None:
+            # fallback — use requested extension with reencode
+            return self.audio_ext, ["-c:a", self.audio_ext]
+        ext, encoder, copy_codecs = self._audio_cfg
+        if copy_codecs is None:
+            can_copy = codec.startswith("pcm")
+        else:
+            can_copy = codec in copy_codecs
+        if can_copy and not force_reencode:
+            return ext, ["-c:a", "copy"]
+        return ext, ["-c:a", encoder]
+
+    def _probe_one(self, infile):
+        # Skip files not yet started once stop() was requested
+        if self._stopped:
+            return None
+        return probe_file(infile, owner=self)
 
     def run(self):
         jobs = []
         try:
-            for infile in self.files:
-                if self._stopped:
+            # ffprobe runs are independent subprocesses: probe files concurrently,
+            # then build jobs in the original file order
+            files = list(self.files)
+            workers = max(1, min(8, os.cpu_count() or 4, len(files)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self._probe_one, f) for f in files]
+                wait(futures, return_when=FIRST_EXCEPTION)
+                failed = next((f for f in futures if f.done() and f.exception()), None)
+                if failed is not None:
+                    # one probe failed: drop queued files, kill running probes
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._kill_probes()
+                    raise failed.exception()
+                infos = [f.result() for f in futures]
+
+            out_base = Path(self.out_dir)
+            codec_opts = {}  # (codec_type, codec, force) -> (ext, codec_opt)
+            try:
+                taken = {os.path.normcase(n) for n in os.listdir(out_base)}
+            except OSError:
+                taken = set()
+            for infile, info in zip(files, infos):
+                if self._stopped or info is None:
                     break
-                info = probe_file(infile)
+                stem = Path(infile).stem
                 streams = info.get("streams", [])
                 duration = float(info.get("format", {}).get("duration") or 0.0)
                 video_added = False
@@ -109,70 +249,25 @@ class _ProbeThread(QtCore.QThread):
                         if video_added:
                             continue
                         video_added = True
-                        ext = self.video_ext
-                        if self.force_reencode:
-                            codec_opt = ["-c:v", "libx264"]
-                        else:
-                            # allow copy only if codec is h264/h265 and container supports it
-                            if codec in ("h264", "hevc") and ext in ("mp4", "mkv", "mov"):
-                                codec_opt = ["-c:v", "copy"]
-                            else:
-                                codec_opt = ["-c:v", "libx264"]
-
-                    # --- AUDIO handling ---
-                    else:
-                        if self.audio_ext == "aac":
-                            ext = "m4a"  # safer container for AAC
-                            if self.force_reencode:
-                                codec_opt = ["-c:a", "aac"]
-                            else:
-                                codec_opt = ["-c:a", "copy"] if codec == "aac" else ["-c:a", "aac"]
-
-                        elif self.audio_ext == "mp3":
-                            ext = "mp3"
-                            if self.force_reencode:
-                                codec_opt = ["-c:a", "libmp3lame"]
-                            else:
-                                codec_opt = ["-c:a", "copy"] if codec == "mp3" else ["-c:a", "libmp3lame"]
-
-                        elif self.audio_ext == "flac":
-                            ext = "flac"
-                            if self.force_reencode:
-                                codec_opt = ["-c:a", "flac"]
-                            else:
-                                codec_opt = ["-c:a", "copy"] if codec == "flac" else ["-c:a", "flac"]
-
-                        elif self.audio_ext == "opus":
-                            ext = "opus"
-                            if self.force_reencode:
-                                codec_opt = ["-c:a", "libopus"]
-                            else:
-                                codec_opt = ["-c:a", "copy"] if codec == "opus" else ["-c:a", "libopus"]
-
-                        elif self.audio_ext == "wav":
-                            ext = "wav"
-                            if self.force_reencode:
-                                codec_opt = ["-c:a", "pcm_s16le"]
-                            else:
-                                codec_opt = ["-c:a", "copy"] if codec.startswith("pcm") else ["-c:a", "pcm_s16le"]
-
-                        else:
-                            # fallback — use requested extension with reencode
-                            ext = self.audio_ext
-                            codec_opt = ["-c:a", self.audio_ext]
+
+                    key = (s["codec_type"], codec, self.force_reencode)
+                    opt = codec_opts.get(key)
+                    if opt is None:
+                        opt = codec_opts[key] = self._derive_codec_opt(*key)
+                    ext, codec_opt = opt
 
                     # --- Output file path ---
-                    outfile = ensure_unique_path(
-                        Path(self.out_dir) / f"{Path(infile).stem}_{lang}.{ext}"
-                    )
+                    outfile = _claim_unique_path(out_base, f"{stem}_{lang}.{ext}", taken)
 
                     # --- Build ffmpeg command ---
-                    cmd = [FFMPEG, "-y", "-i", infile, "-map", f"0:{idx}", *codec_opt, str(outfile)]
+                    cmd = [FFMPEG, "-y", "-i", infile, "-map", f"0:{idx}", *codec_opt,
+                           "-threads", str(self.ffmpeg_threads), str(outfile)]
                     jobs.append((cmd, outfile, duration))
 
             self.done.emit(jobs, "")
         except Exception as e:
-            self.done.emit([], str(e))
+            # a probe killed by stop() is not an error worth reporting
+            self.done.emit([], "" if self._stopped else str(e))
 
 
 
@@ -181,6 +276,7 @@ class DemuxTab(QWidget):
         super().__init__()
         self.settings = settings
         self.files = []
+        self._basenames: set[str] = set()  # lower-cased names of self.files, for dedup
         self.jobs = []
         self.active_jobs = []   # keep worker references alive
         self.max_parallel = 1
@@ -234,7 +330,6 @@ class DemuxTab(QWidget):
         header.setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)          # File column expands
         header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents) # Status auto-size
         layout.addWidget(self.table, stretch=1)  # let table grow with window
-        layout.addWidget(self.table)
 
 
         # Options row
@@ -275,6 +370,12 @@ class DemuxTab(QWidget):
 
         self.progress = QProgressBar()
         layout.addWidget(self.progress)
+        # ~30 Hz poll of the running workers' progress_pct while jobs are active
+        self._batch_total = 0   # ffmpeg jobs in the current batch
+        self._batch_done = 0    # of those, finished or failed
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setInterval(33)
+        self._progress_timer.timeout.connect(self._poll_progress)
 
         self.log = QtWidgets.QTextEdit()
         self.log.setReadOnly(True)
@@ -294,25 +395,28 @@ class DemuxTab(QWidget):
         if not files:
             return
 
-        added = 0
         skipped = 0
-        existing_basenames = {Path(x).name.lower() for x in self.files}
-
+        new_files = []
         for f in files:
             base_name = Path(f).name.lower()
-            if base_name in existing_basenames:
+            if base_name in self._basenames:
                 skipped += 1
                 self.log.append(f"⚠️ Skipped duplicate file: {Path(f).name}")
                 continue
-
-            self.files.append(f)
-            existing_basenames.add(base_name)
-
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(f))
-            self.table.setItem(row, 1, QTableWidgetItem("Pending"))
-            added += 1
+            new_files.append(f)
+            self._basenames.add(base_name)
+
+        # Size the table once and fill the new rows in place
+        start = self.table.rowCount()
+        with batched_table_updates(self.table):
+            self.table.setRowCount(start + len(new_files))
+            for row, f in enumerate(new_files, start):
+                item = QTableWidgetItem(f)
+                item.setData(Qt.UserRole, f)  # marks an input row (audio rows have none)
+                self.table.setItem(row, 0, item)
+                self.table.setItem(row, 1, _status_item(_Status.PENDING))
+        self.files.extend(new_files)
+        added = len(new_files)
 
         self.log.append(f"✅ Added {added} file(s), skipped {skipped} duplicate(s).")
 
@@ -324,13 +428,9 @@ class DemuxTab(QWidget):
             QMessageBox.information(self, "Remove Selected", "No rows selected.")
             return
 
-        count = 0
-        for idx in sorted(selected, key=lambda x: x.row(), reverse=True):
-            row = idx.row()
-            if row < len(self.files):
-                del self.files[row]
-            self.table.removeRow(row)
-            count += 1
+        rows = [idx.row() for idx in selected]
+        self._remove_rows(rows)
+        count = len(rows)
 
         self.log.append(f"🗑️ Removed {count} selected file(s).")
 
@@ -352,29 +452,51 @@ class DemuxTab(QWidget):
 
         self.table.setRowCount(0)
         self.files.clear()
+        self._basenames.clear()
         self.log.append("🧹 Cleared all files.")
 
                 
     def clean_finished_rows(self):
         """Remove rows already marked Done or Error before adding new files"""
-        for row in reversed(range(self.table.rowCount())):
+        finished = []
+        for row in range(self.table.rowCount()):
             status_item = self.table.item(row, 1)
-            if status_item and status_item.text() in ("Done", "Error"):
-                self.table.removeRow(row)
-                if row < len(self.files):
-                    del self.files[row]
-                    
+            if status_item and (status_item.data(Qt.UserRole) or 0) >= _Status.DONE:
+                finished.append(row)
+        self._remove_rows(finished)
+
+    def _input_path(self, row):
+        """Input file shown on a table row, or None for generated audio rows."""
+        item = self.table.item(row, 0)
+        return item.data(Qt.UserRole) if item else None
+
+    def _remove_rows(self, rows):
+        """Remove table rows in contiguous ranges and drop their input files."""
+        removed = set()
+        for row in rows:
+            path = self._input_path(row)
+            if path:
+                removed.add(path)
+        model = self.table.model()
+        for first, count in _row_ranges(rows):
+            model.removeRows(first, count)
+        if removed:
+            self.files = [f for f in self.files if f not in removed]
+            for f in removed:
+                self._basenames.discard(Path(f).name.lower())
+
     def cleanup_on_exit(self):
         """Stop all jobs and clean up workers when app exits"""
+        self._job_queue = []   # don't let error/finished slots launch more
+        workers = list(self.active_jobs)
         self.stop_jobs()
-        for worker in list(self.active_jobs):
-            try:
-                if hasattr(worker, "stop"):
-                    worker.stop()
-            except Exception:
-                pass
-            worker.deleteLater()
-        self.active_jobs.clear()
+        for worker in workers:
+            if isinstance(worker, FfmpegWorker):
+                worker.wait()   # stop() already terminated its ffmpeg
+                continue
+            terminate_process(getattr(worker, "_proc", None))
+            join_thread(worker)
+        save_probe_cache()
 
     def choose_out_dir(self):
         d = QFileDialog.getExistingDirectory(self, "Select output directory")
@@ -412,6 +534,7 @@ class DemuxTab(QWidget):
             self.video_format_combo.currentText(),
             self.force_reencode.isChecked(),
             demux_dir,
+            self.max_jobs_spin.value() if self.parallel_chk.isChecked() else 1,
         )
 
         def _on_done(jobs, err):
@@ -419,6 +542,9 @@ class DemuxTab(QWidget):
             self._file_jobs_done = {}   # completed jobs per input file
 
             self.start_btn.setEnabled(True)
+            if t._stopped:
+                self.log.append("Probing stopped.")
+                return
             if err:
                 QMessageBox.critical(self, "Demux", f"Probe error: {err}")
                 return
@@ -428,40 +554,44 @@ class DemuxTab(QWidget):
 
             # turn job list into workers
             self._job_queue = []
-            start_row = self.table.rowCount()   # append after existing rows
-            for i, (cmd, outfile, duration) in enumerate(jobs):
-                # Default to mapping each job to its own row
-                row = self.table.rowCount()
-
-                # Always map jobs to the input file row from add_files
-                infile = Path(cmd[2]).name if len(cmd) > 2 else None
-                if str(outfile).endswith((".mp4", ".mkv", ".mov")):
-                    # Video → reuse the input file row
-                    try:
-                        row = self.files.index(infile)
-                    except Exception:
-                        row = 0
-                    self.table.setItem(row, 1, QTableWidgetItem("Pending"))
-                    self.log.append(f"Queued video stream: {outfile}")
-                else:
-                    # Audio → add new row
-                    row = self.table.rowCount()
-                    self.table.insertRow(row)
-                    self.table.setItem(row, 0, QTableWidgetItem(str(outfile)))
-                    self.table.setItem(row, 1, QTableWidgetItem("Pending"))
-                    self.log.append(f"Queued audio stream: {outfile}")
-                # Initialize job counters per row
-                self._file_job_counts.setdefault(row, 0)
-                self._file_job_counts[row] += 1
-                self._file_jobs_done.setdefault(row, 0)
-                # create worker bound to chosen row
-                worker = FfmpegWorker(cmd, str(outfile), duration)
-                worker.progress.connect(self.progress.setValue)
-                worker.finished.connect(lambda f=outfile, r=row, w=worker: self._on_job_finished(f, r, w))
-                worker.error.connect(lambda msg, r=row, w=worker: self._on_job_error(msg, r, w))
-                self._job_queue.append((worker, row))
-
-
+            is_video = [str(outfile).endswith(_VIDEO_SUFFIXES) for _, outfile, _ in jobs]
+            # append all audio rows after existing rows with one resize
+            next_audio_row = self.table.rowCount()
+            file_row_map = {}
+            for r in range(next_audio_row):
+                path = self._input_path(r)
+                if path:
+                    file_row_map[path] = r
+            with batched_table_updates(self.table):
+                self.table.setRowCount(next_audio_row + is_video.count(False))
+                for i, (cmd, outfile, duration) in enumerate(jobs):
+                    # Always map jobs to the input file row from add_files
+                    infile = cmd[cmd.index("-i") + 1]
+                    if is_video[i]:
+                        # Video → reuse the input file row
+                        row = file_row_map.get(infile, 0)
+                        self._set_status(row, _Status.PENDING)
+                        self.log.append(f"Queued video stream: {outfile}")
+                    else:
+                        # Audio → fill the next pre-sized row
+                        row = next_audio_row
+                        next_audio_row += 1
+                        self.table.setItem(row, 0, QTableWidgetItem(str(outfile)))
+                        self.table.setItem(row, 1, _status_item(_Status.PENDING))
+                        self.log.append(f"Queued audio stream: {outfile}")
+                    # Initialize job counters per row
+                    self._file_job_counts.setdefault(row, 0)
+                    self._file_job_counts[row] += 1
+                    self._file_jobs_done.setdefault(row, 0)
+                    # create worker bound to chosen row
+                    worker = FfmpegWorker(cmd, str(outfile), duration)
+                    worker.finished.connect(partial(self._on_job_finished, row, worker))
+                    worker.error.connect(partial(self._on_job_error, row, worker))
+                    self._job_queue.append((worker, row))
+
+            self._batch_total = len(self._job_queue)
+            self._batch_done = 0
+            self.progress.setValue(0)
 
             # start jobs depending on parallel mode
             slots = self.max_jobs_spin.value() if self.parallel_chk.isChecked() else 1
@@ -478,25 +608,46 @@ class DemuxTab(QWidget):
         self.active_jobs.clear()
         self.jobs.clear()
 
+    def _set_status(self, row, status):
+        """Update the row's status cell in place (reusing its item)."""
+        item = self.table.item(row, 1)
+        if item is None:
+            self.table.setItem(row, 1, _status_item(status))
+        else:
+            item.setText(status.label)
+            item.setData(Qt.UserRole, int(status))
+
     def _launch_next_job(self):
         if not getattr(self, "_job_queue", None):
             return
         worker, row = self._job_queue.pop(0)
-        self.table.setItem(row, 1, QTableWidgetItem("Running"))
+        self._set_status(row, _Status.RUNNING)
         self.active_jobs.append(worker)
         worker.start()
-
-    def _on_job_finished(self, outfile, row, worker):
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _poll_progress(self):
+        """Show the whole batch's progress: done jobs count 100, running ones their progress_pct."""
+        running = [w for w in self.active_jobs if isinstance(w, FfmpegWorker)]
+        if self._batch_total:
+            pct = self._batch_done * 100 + sum(w.progress_pct for w in running)
+            self.progress.setValue(min(100, pct // self._batch_total))
+        if not running:
+            self._progress_timer.stop()
+
+    def _on_job_finished(self, row, worker, outfile):
+        self._batch_done += 1
         # Mark one job finished for this row
         self._file_jobs_done[row] += 1
 
         if self._file_jobs_done[row] >= self._file_job_counts[row]:
             # All jobs for this file done
-            self.table.setItem(row, 1, QTableWidgetItem("Done"))
+            self._set_status(row, _Status.DONE)
             self.log.append(f"All streams finished for row {row}")
         else:
             # Still waiting on other streams
-            self.table.setItem(row, 1, QTableWidgetItem("Running"))
+            self._set_status(row, _Status.RUNNING)
 
         self.log.append(f"Finished: {outfile}")
         if worker in self.active_jobs:
@@ -515,8 +666,9 @@ class DemuxTab(QWidget):
                 self._launch_next_job()
 
 
-    def _on_job_error(self, msg, row, worker):
-        self.table.setItem(row, 1, QTableWidgetItem("Error"))
+    def _on_job_error(self, row, worker, msg):
+        self._batch_done += 1
+        self._set_status(row, _Status.ERROR)
         self.log.append(f"Error: {msg}")
         try:
             self.log.append(f"Command failed: {' '.join(worker.cmd)}")
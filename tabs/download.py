@@ -1,35 +1,67 @@
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Set, Deque
 from pathlib import Path
 import re
 import urllib.request
 from urllib.parse import urljoin
 import datetime
 import subprocess
-import os, time
+import os, sys, time
+import json
+import asyncio
+from functools import partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QLineEdit, QTableWidget, QTableWidgetItem, QFileDialog,
     QMessageBox, QAbstractItemView, QComboBox, QCheckBox,
-    QTextEdit, QHeaderView, QProgressBar, QSplitter, QSpinBox
+    QPlainTextEdit, QHeaderView, QProgressBar, QSplitter, QSpinBox
 )
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QThreadPool, Signal, QObject
 
-from utils import verify_tools
+try:
+    import orjson  # optional, faster JSON parsing
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads  # also accepts bytes
+
+try:
+    import requests  # optional: keep-alive connection pooling
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    _SESSION = requests.Session()
+    _SESSION.headers["User-Agent"] = "Mozilla/5.0"
+    # A few hosts (un.org, kaltura.com) serve nearly everything: keep a pool
+    # per host sized for the 16 parallel jobs the tab allows, and retry
+    # transient failures briefly
+    _adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                           max_retries=Retry(total=2, backoff_factor=0.3))
+    _SESSION.mount("http://", _adapter)
+    _SESSION.mount("https://", _adapter)
+except ImportError:
+    _SESSION = None  # fall back to urllib (new connection per request)
+_HTTP_TIMEOUT = (6, 20)  # (connect, read) seconds
+
+from utils import (
+    verify_tools, terminate_process, batched_table_updates, TTLCache, cache_dir,
+    get_async_loop
+)
 verify_tools()
 
 # If these utilities exist in your project, keep the import. Otherwise, remove or adapt.
 try:
     from utils import (
         build_path_with_suffix, pick_video_suffix_from_format,
-        normalize_lang_code, get_bin_path, FFMPEG, FFPROBE, YTDLP
+        normalize_lang_code, get_bin_path, no_console_flags, FFMPEG, FFPROBE, YTDLP
     )
 except Exception:
     # Fallback no-ops to keep the module importable if utils isn't present
     def build_path_with_suffix(path, *a, **k): return path
     def pick_video_suffix_from_format(*a, **k): return ".mp4"
     def normalize_lang_code(x): return x
+    def no_console_flags(): return {}
     FFMPEG = "ffmpeg"
     FFPROBE = "ffprobe"
     YTDLP = "yt-dlp"
@@ -60,14 +92,28 @@ except Exception:
             # except Exception:
                 # pass
                 
-class LogView(QTextEdit):
+class LogView(QPlainTextEdit):
+    """Plain-text log capped at 2000 lines; appends are flushed every 100 ms."""
     def __init__(self):
         super().__init__()
         self.setReadOnly(True)
+        self.setMaximumBlockCount(2000)
+        self._pending: List[str] = []
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush)
 
     def append_line(self, t: str):
         ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.append(f"[{ts}] {t}")
+        self._pending.append(f"[{ts}] {t}")
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        if self._pending:
+            self.appendPlainText("\n".join(self._pending))
+            self._pending.clear()
 
 
 # ---------- yt-dlp logger ----------
@@ -104,6 +150,8 @@ class DownloadWorker(QObject):
         self.label = label
         self._cancelled = False
         self._proc = None
+        self._last_pct = -1
+        self._last_emit_ns = 0
 
         # Ensure our hook is present, but do not assume any GUI objects
         hooks = list(self.opts.get("progress_hooks", []))
@@ -128,6 +176,14 @@ class DownloadWorker(QObject):
                     pass
 
 
+    def _emit_progress(self, pct, force=False):
+        """Emit progress at most every 100 ms and only when it changed."""
+        now = time.monotonic_ns()
+        if force or (pct != self._last_pct and now - self._last_emit_ns > 100_000_000):
+            self._last_pct = pct
+            self._last_emit_ns = now
+            self.progress.emit(pct, self.label)
+
     # This hook is called by yt-dlp in the *worker* thread
     def _progress_hook_emit_only(self, d):
         # surface progress via signal; never touch GUI here
@@ -137,10 +193,10 @@ class DownloadWorker(QObject):
             total = d.get("total_bytes") or d.get("total_bytes_estimate") or 1
             done = d.get("downloaded_bytes", 0)
             pct = int(done * 100 / max(1, total))
-            self.progress.emit(pct, self.label)
+            self._emit_progress(pct, force=pct >= 100)
         elif d.get("status") == "finished":
             # 100% at finalize
-            self.progress.emit(100, self.label)
+            self._emit_progress(100, force=True)
             fn = d.get("filename")
             if fn:
                 self.log.emit(f"Downloaded to {fn}")
@@ -148,16 +204,31 @@ class DownloadWorker(QObject):
     def run(self):
         try:
             # --- NEW: direct file bypass ---
-            if self.url.lower().endswith((".mp3", ".mp4", ".m4a", ".ogg", ".wav", ".webm")):
+            if _url_ext(self.url) in _DIRECT_EXTS:
                 self.log.emit(f"▶ Direct download: {self.label}")
                 try:
-                    import shutil
                     outfile = Path(self.opts["outtmpl"])
                     outfile.parent.mkdir(parents=True, exist_ok=True)
 
                     self.log.emit(f"Downloading direct file → {outfile}")
-                    with urllib.request.urlopen(self.url) as resp, open(outfile, "wb") as f:
-                        shutil.copyfileobj(resp, f)
+                    if _SESSION is not None:
+                        # pooled connection: repeat downloads from a host skip the handshake
+                        with _SESSION.get(self.url, stream=True, timeout=_HTTP_TIMEOUT) as r:
+                            r.raise_for_status()
+                            with open(outfile, "wb") as f:
+                                for chunk in r.iter_content(chunk_size=1 << 20):
+                                    f.write(chunk)
+                    else:
+                        # copy through one reused 1 MiB buffer (copyfileobj uses 16 KiB reads)
+                        buf = bytearray(1 << 20)
+                        mv = memoryview(buf)
+                        with urllib.request.urlopen(self.url, timeout=_HTTP_TIMEOUT[1]) as resp, \
+                                open(outfile, "wb") as f:
+                            while True:
+                                n = resp.readinto(buf)
+                                if not n:
+                                    break
+                                f.write(mv[:n])
                     self.log.emit(f"✔ Saved direct file to {self.opts['outtmpl']}")
                     self.progress.emit(100, self.label)
                     self.finished.emit(self.label)
@@ -168,7 +239,9 @@ class DownloadWorker(QObject):
             # --- END bypass ---
             self.log.emit(f"▶ Starting {self.label}")
             self.log.emit(f"⬇️ Download starting: {self.label}")
-            cmd = [YTDLP, "-f", self.opts.get("format", "best"), self.url]
+            cmd = [YTDLP, "-f", self.opts.get("format", "best"), self.url,
+                   # HLS/DASH: fetch fragments in parallel instead of one at a time
+                   "--concurrent-fragments", str(self.opts.get("concurrent_fragments", 8))]
 
             if "outtmpl" in self.opts:
                 cmd.extend(["-o", self.opts["outtmpl"]])
@@ -176,39 +249,31 @@ class DownloadWorker(QObject):
                 cmd.extend(["--merge-output-format", self.opts["merge_output_format"]])
 
             # Prevent console pop-up on Windows
-            startupinfo = None
-            creationflags = 0
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creationflags = subprocess.CREATE_NO_WINDOW
-
             self._proc = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,   # merge stderr into stdout
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                startupinfo=startupinfo,
-                creationflags=creationflags
+                bufsize=64 * 1024,          # bytes: only decode lines we log
+                **_NO_CONSOLE
             )
 
             # Stream output safely
-            for line in iter(self._proc.stdout.readline, ''):
+            for raw in iter(self._proc.stdout.readline, b''):
                 if self._cancelled:
                     break
-                line = line.strip()
-                if not line:
+                raw = raw.strip()
+                if not raw:
                     continue
-                if "[download]" in line and "%" in line:
-                    m = re.search(r"(\d+(?:\.\d+)?)%", line)
+                # progress lines are most of the output: parse them without decoding
+                if raw.startswith(b"[download]"):
+                    m = _PROGRESS_RE.search(raw)
                     if m:
                         pct = int(float(m.group(1)))
-                        self.progress.emit(pct, self.label)
+                        self._emit_progress(pct, force=pct >= 100)
+                        continue
+                elif raw.startswith(b"[debug]"):
                     continue
-                if not line.startswith("[debug]"):
-                    self.log.emit(line)
+                self.log.emit(raw.decode("utf-8", errors="replace"))
 
             self._proc.wait()
 
@@ -231,35 +296,181 @@ class DownloadWorker(QObject):
 
 # ---------- Helpers ----------
 
+# Direct media files are downloaded without yt-dlp
+_AUDIO_EXTS = frozenset({".mp3", ".m4a", ".ogg", ".wav"})
+_VIDEO_EXTS = frozenset({".mp4", ".webm"})
+_DIRECT_EXTS = _AUDIO_EXTS | _VIDEO_EXTS
+
+# Folder opener for the platform, picked once
+if sys.platform.startswith("win"):
+    _open_folder = os.startfile  # type: ignore[attr-defined]
+elif sys.platform == "darwin":
+    def _open_folder(path: str): subprocess.Popen(["open", path])
+else:
+    def _open_folder(path: str): subprocess.Popen(["xdg-open", path])
+
+def _url_ext(url: str) -> str:
+    """Lower-cased extension of the URL's last path segment ('' if none)."""
+    return os.path.splitext(url)[1].lower()
+
+# STARTUPINFO/CREATE_NO_WINDOW built once for every subprocess below
+_NO_CONSOLE = no_console_flags()
+
+# URL/format lookups persisted between runs (see DownloadTab._save_caches)
+_CACHE_NAME = "download_cache.json"
+
+# Page scrapers search the raw response bytes: no decode of the whole page
+_MEDIA_ABS_RE = re.compile(rb'["\'](https?://[^"\']+\.(?:mp3|mp4|m4a|ogg|wav|webm))["\']', re.IGNORECASE)
+_MEDIA_REL_RE = re.compile(rb'["\'](/[^"\']+\.(?:mp3|mp4|m4a|ogg|wav|webm))["\']', re.IGNORECASE)
+_HLS_RE = re.compile(rb'["\'](https?://[^"\']+\.m3u8[^"\']*)["\']', re.IGNORECASE)
+_UN_FILE_RE = re.compile(rb'["\']file["\']\s*:\s*["\']([^"\']+\.(?:mp3|mp4))["\']')
+_UN_DOWNLOADURL_RE = re.compile(rb'["\']downloadurl["\']\s*:\s*["\']([^"\']+)["\']')
+_ENTRY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    rb'data-entry=["\'](1_[0-9A-Za-z]+)["\']',
+    rb'entry_id[/"\\s:]+([0-9A-Za-z_]+)',
+    rb'["\']entry[_-]?id["\']\s*[:=]\s*["\']([0-9A-Za-z_]+)',
+    rb'kaltura.*?/entry_id/([0-9A-Za-z_]+)',
+    rb'data[-_]entryid=["\']([0-9A-Za-z_]+)',
+    rb'\b1_[0-9A-Za-z]+',
+    rb'"entryId"\s*:\s*"([0-9A-Za-z_]+)"',
+    rb'<iframe[^>]+entry_id/([0-9A-Za-z_]+)',
+)]
+_UN_MEDIA_LINK_RE = re.compile(rb'https://media\.un\.org/[^\s"\']+')
+_MEDIA_ENTRY_ID_RE = re.compile(rb'"entry_id"\s*:\s*"([0-9A-Za-z_]+)"')
+_PROGRESS_RE = re.compile(rb"(\d+(?:\.\d+)?)%")
+
+def _fetch_html(url: str, user_agent: str = "Mozilla/5.0") -> bytes:
+    """GET a page's raw bytes, reusing pooled connections when requests is available."""
+    headers = {"User-Agent": user_agent}
+    if _SESSION is not None:
+        r = _SESSION.get(url, headers=headers, timeout=_HTTP_TIMEOUT)
+        r.raise_for_status()
+        return r.content
+    req = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT[1]) as resp:
+        return resp.read()
+
+def _group_str(m: re.Match) -> str:
+    """The capture group (or whole match if it has none) of a bytes match, as text."""
+    return m.group(m.lastindex or 0).decode("utf-8", errors="ignore")
+
+# ---------- Format listing (asyncio) ----------
+# One event loop thread runs every yt-dlp format probe instead of a QThread per URL.
+# Only title and formats are printed (not the whole -J info dict), and a playlist
+# only has its first entry extracted, which is all the format table ever showed.
+_FORMAT_ARGS = [
+    "--print", "%(.{title,formats})j",
+    "--playlist-items", "1",
+    "--skip-download", "--no-warnings",
+    "--socket-timeout", "20",
+    "--extractor-args", "youtube:player_client=android,player_skip=dash=False",
+    "--format-sort", "res,ext",
+    "--merge-output-format", "mp4",
+    "--geo-bypass",
+    "--no-check-certificates",
+    "--ignore-errors",
+    "--compat-options", "manifest-filesize-approx",
+    "--add-header", "User-Agent: Mozilla/5.0",
+]
+_format_procs = set()  # running yt-dlp format probes (touched only on the loop thread)
+
+def _stop_format_fetches():
+    """Kill running format probes (app exit); the shared loop keeps running."""
+    if not _format_procs:
+        return
+    def _kill():
+        for proc in list(_format_procs):
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+    get_async_loop().call_soon_threadsafe(_kill)
+
+async def _run_ytdlp_json(url: str, timeout: float = 30):
+    proc = await asyncio.create_subprocess_exec(
+        YTDLP, *_FORMAT_ARGS, url,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        **_NO_CONSOLE
+    )
+    _format_procs.add(proc)
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    finally:
+        _format_procs.discard(proc)
+    return out, err, proc.returncode
+
+async def _fetch_formats(url: str):
+    """Print title/formats for url with yt-dlp; returns (formats, info, error)."""
+    try:
+        try:
+            # Increased from 10 → 30 seconds to avoid premature timeout
+            out, err, rc = await _run_ytdlp_json(url)
+        except asyncio.TimeoutError:
+            try:
+                # Retry once more in case the server was slow
+                out, err, rc = await _run_ytdlp_json(url)
+            except asyncio.TimeoutError:
+                return [], {}, "Timeout fetching formats (second try)."
+
+        if rc == 0 and out.strip():
+            data = _loads(out.strip().split(b"\n", 1)[0])  # one JSON line per video
+            formats = data.get("formats") or []
+            info = {"title": data.get("title")}
+            if not formats and "entries" in data:
+                # playlist or single entry fallback
+                entry = data["entries"][0] if data["entries"] else {}
+                formats = entry.get("formats", [])
+            if formats:
+                return formats, info, ""
+            return [], info, "No downloadable formats found. Try updating yt-dlp."
+        err_msg = (err.decode("utf-8", errors="replace").strip()
+                   or f"yt-dlp exited with code {rc}")
+        return [], {}, err_msg
+    except Exception as e:
+        return [], {}, str(e)
+
+class _FormatFetch(QObject):
+    """Carries one _fetch_formats result from the loop thread to the GUI thread."""
+    done = Signal(list, dict, str)  # (formats, info, error)
+
+    def emit_result(self, future):
+        try:
+            self.done.emit(*future.result())
+        except Exception as e:  # cancelled when the loop stops at exit
+            self.done.emit([], {}, str(e) or "Format listing cancelled")
+
 # ---------- yt-dlp auto-update helper ----------
 def ensure_ytdlp_latest():
     """Check and update yt-dlp automatically (non-blocking)."""
     try:
-        subprocess.run([YTDLP, "-U"], timeout=15)
+        subprocess.run([YTDLP, "-U"], timeout=15, **_NO_CONSOLE)
     except Exception as e:
         print(f"yt-dlp update check failed: {e}")
 
 def extract_direct_media_file(url: str) -> str | None:
     """Try to find direct audio/video URLs in any webpage HTML."""
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
+        html = _fetch_html(url)
 
         # Look for absolute media URLs
-        m = re.search(r'["\'](https?://[^"\']+\.(?:mp3|mp4|m4a|ogg|wav|webm))["\']', html, re.IGNORECASE)
+        m = _MEDIA_ABS_RE.search(html)
         if m:
-            return m.group(1)
+            return _group_str(m)
 
         # Look for relative media URLs
-        m = re.search(r'["\'](/[^"\']+\.(?:mp3|mp4|m4a|ogg|wav|webm))["\']', html, re.IGNORECASE)
+        m = _MEDIA_REL_RE.search(html)
         if m:
-            return urljoin(url, m.group(1))
+            return urljoin(url, _group_str(m))
 
         # Look for HLS streams
-        m = re.search(r'["\'](https?://[^"\']+\.m3u8[^"\']*)["\']', html, re.IGNORECASE)
+        m = _HLS_RE.search(html)
         if m:
-            return m.group(1)
+            return _group_str(m)
 
     except Exception as e:
         print(f"extract_direct_media_file error: {e}")
@@ -269,31 +480,17 @@ def extract_direct_media_file(url: str) -> str | None:
 def extract_un_media_file(url: str) -> Optional[str]:
     """Fetch a UN News page and try to extract the direct audio/video file URL."""
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        )
-        with urllib.request.urlopen(req) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
-
-        # Look for common file fields
-        m = re.search(r'["\']file["\']\s*:\s*["\']([^"\']+\.(?:mp3|mp4))["\']', html)
-        if m:
-            file_url = m.group(1)
-            if file_url.startswith("/"):
-                # prefix relative URL
-                from urllib.parse import urljoin
-                file_url = urljoin(url, file_url)
-            return file_url
-
-        # fallback: look for "downloadurl"
-        m = re.search(r'["\']downloadurl["\']\s*:\s*["\']([^"\']+)["\']', html)
-        if m:
-            file_url = m.group(1)
-            if file_url.startswith("/"):
-                from urllib.parse import urljoin
-                file_url = urljoin(url, file_url)
-            return file_url
+        html = _fetch_html(url, "Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
+
+        # Look for common file fields, then fall back to "downloadurl"
+        for rx in (_UN_FILE_RE, _UN_DOWNLOADURL_RE):
+            m = rx.search(html)
+            if m:
+                file_url = _group_str(m)
+                if file_url.startswith("/"):
+                    # prefix relative URL
+                    file_url = urljoin(url, file_url)
+                return file_url
 
     except Exception as e:
         print(f"extract_un_media_file error: {e}")
@@ -316,38 +513,20 @@ def derive_entry_id_from_webtv(url: str) -> Optional[str]:
 
 def fetch_entry_id_from_html(url: str) -> Optional[str]:
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        )
-        with urllib.request.urlopen(req) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
+        html = _fetch_html(url, "Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
 
         # Common patterns
-        patterns = [
-            r'data-entry=["\'](1_[0-9A-Za-z]+)["\']',
-            r'entry_id[/"\\s:]+([0-9A-Za-z_]+)',
-            r'["\']entry[_-]?id["\']\s*[:=]\s*["\']([0-9A-Za-z_]+)',
-            r'kaltura.*?/entry_id/([0-9A-Za-z_]+)',
-            r'data[-_]entryid=["\']([0-9A-Za-z_]+)',
-            r'\b1_[0-9A-Za-z]+',
-            r'"entryId"\s*:\s*"([0-9A-Za-z_]+)"',
-            r'<iframe[^>]+entry_id/([0-9A-Za-z_]+)'
-         ]
-
-        for pat in patterns:
-            m = re.search(pat, html, re.IGNORECASE)
+        for rx in _ENTRY_PATTERNS:
+            m = rx.search(html)
             if m:
-                return m.group(1)
-                
-        m = re.search(r'https://media\.un\.org/[^\s"\']+', html)
+                return _group_str(m)
+
+        m = _UN_MEDIA_LINK_RE.search(html)
         if m:
-            media_url = m.group(0)
-            with urllib.request.urlopen(media_url) as resp2:
-                media_html = resp2.read().decode("utf-8", errors="ignore")
-            mm = re.search(r'"entry_id"\s*:\s*"([0-9A-Za-z_]+)"', media_html)
+            media_html = _fetch_html(_group_str(m))
+            mm = _MEDIA_ENTRY_ID_RE.search(media_html)
             if mm:
-                return mm.group(1)
+                return _group_str(mm)
 
     except Exception as e:
         print(f"fetch_entry_id_from_html error: {e}")
@@ -366,13 +545,22 @@ class DownloadTab(QWidget):
 
     def __init__(self, settings):
         super().__init__()
-        self._progress_map = {}
+        self._progress_map: Dict[str, int] = {}   # label -> last pct, rows counted in the overall bar
+        self._progress_timer = QtCore.QTimer(self)  # coalesces overall-bar repaints
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(100)
+        self._progress_timer.timeout.connect(self._update_overall_progress)
         self.settings = settings
         self.default_lang = self.settings.data.get("default_lang", "eng")
         
         # URL + extractor
         self.url_edit = QLineEdit()
-        self.url_edit.textChanged.connect(self._on_url_changed)
+        # Handle the URL once typing/pasting settles, not on every keystroke
+        self._url_debounce = QtCore.QTimer(self)
+        self._url_debounce.setSingleShot(True)
+        self._url_debounce.setInterval(400)
+        self._url_debounce.timeout.connect(self._on_url_settled)
+        self.url_edit.textChanged.connect(self._url_debounce.start)
 
         # Entry id
         self.entry_edit = QLineEdit()
@@ -382,7 +570,6 @@ class DownloadTab(QWidget):
         self.dir_edit = QLineEdit(self.settings.data.get("last_output_dir", {}).get("download", str(Path.cwd())))
         self.dir_btn = QPushButton("Browse")
         
-        self.url_edit.textChanged.connect(self._auto_handle_url)
         #self.entry_edit.textChanged.connect(self._auto_handle_url)
 
         # Controls
@@ -495,13 +682,23 @@ class DownloadTab(QWidget):
 
         # State
         self._last_info = None
-        self._format_cache = {}   # { url: [formats list] }
-        self.active_threads: List[QThread] = []
+        # { url: {"formats": [...], "info": {"title": ...}} }; only format ids are
+        # reused from it, so entries stay valid for a day
+        self._format_cache = TTLCache(maxsize=128, ttl=86400)
+        self._url_cache = TTLCache(maxsize=512, ttl=1800)     # { page url: media url }
+        self._inflight_formats: Set[str] = set()  # urls with a format fetch running
+        self._load_caches()
+        # Download workers run on a private pool sized by "Max jobs"; _queue and
+        # _start_worker still decide when a job (and its table row) starts
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.max_jobs_spin.value())
+        self.max_jobs_spin.valueChanged.connect(self._pool.setMaxThreadCount)
         self._total = 0
         self._completed = 0
         self._remaining = 0
-        self._queue: List[Tuple[str, str, dict]] = []
-        self._active_rows: Dict[str, Tuple[int, str, DownloadWorker, QThread]] = {}
+        self._queue: Deque[Tuple[str, str, dict]] = deque()
+        self._active_rows: Dict[str, Tuple[int, str, DownloadWorker]] = {}
+        self._running_count = 0     # workers launched and not yet finished/failed/cancelled
 
     # --- Helper methods ---
     # def toggle_debug(self, state):
@@ -520,36 +717,74 @@ class DownloadTab(QWidget):
         d = self.dir_edit.text().strip()
         if not d:
             return
-        self.settings.data.setdefault("last_output_dir", {})
-        self.settings.data["last_output_dir"]["download"] = d
+        self.settings.set_out_dir("download", d)
         self.output_dir_changed.emit()
         
     def cleanup_on_exit(self):
         """Stop all active downloads and clean up threads when app exits"""
         self._cancel_all()
-        for t in list(self.active_threads):
-            try:
-                t.quit()
-                t.wait()
-            except Exception:
-                pass
-        self.active_threads.clear()
+        _stop_format_fetches()
+        for _row, _outtmpl, worker in list(self._active_rows.values()):
+            terminate_process(worker._proc)
+        self._pool.waitForDone(3000)
         self._active_rows.clear()
+        self._running_count = 0
         self._queue.clear()
+        self._save_caches()
+
+    def _load_caches(self):
+        """Reload URL/format lookups saved by a previous run."""
+        try:
+            with open(cache_dir() / _CACHE_NAME, "rb") as f:
+                data = _loads(f.read())  # can hold many format lists; orjson when available
+            self._format_cache.load(data.get("meta", {}))
+            self._url_cache.load(data.get("urls", {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[download cache] warning: {e}")
+
+    def _save_caches(self):
+        try:
+            data = {"meta": self._format_cache.to_dict(), "urls": self._url_cache.to_dict()}
+            folder = cache_dir()
+            folder.mkdir(parents=True, exist_ok=True)
+            with open(folder / _CACHE_NAME, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"[download cache] could not save: {e}")
+
+    def clear_metadata_cache(self):
+        """Forget cached yt-dlp metadata and resolved URLs (memory and disk)."""
+        self._format_cache.clear()
+        self._url_cache.clear()
+        self._save_caches()
+        self.log.append_line("🧹 Cleared metadata cache")
 
     def _cancel_all(self):
         self.log.append_line("Cancelling all downloads…")
-        for label, (row, _, worker, _) in list(self._active_rows.items()):
+        for label, (row, _, worker) in list(self._active_rows.items()):
             worker.cancel()
-            self.active_table.setItem(row, 2, QTableWidgetItem("Cancelling…"))
+            self._set_cell(row, 2, "Cancelling…")
         self._queue.clear()
         self.global_status.setText("Cancel requested for all downloads")
 
+    def _set_cell(self, row: int, col: int, text: str):
+        """Update an active-table cell in place, reusing its item."""
+        item = self.active_table.item(row, col)
+        if item is None:
+            self.active_table.setItem(row, col, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
     def _clear_finished(self):
         # Iterate backwards so row indices stay valid when removing
         for row in reversed(range(self.active_table.rowCount())):
             status_item = self.active_table.item(row, 2)
             if status_item and status_item.text() in ("Finished", "Cancelled"):
+                label_item = self.active_table.item(row, 0)
+                if label_item:
+                    self._progress_map.pop(label_item.text(), None)
                 self.active_table.removeRow(row)
 
         self.log.append_line("Cleared finished downloads")
@@ -569,7 +804,7 @@ class DownloadTab(QWidget):
         url_lower = url_in.lower()
 
         # Direct media file shortcut
-        if url_lower.endswith((".mp3", ".mp4", ".m4a", ".ogg", ".wav", ".webm")):
+        if _url_ext(url_in) in _DIRECT_EXTS:
             self.log.append_line("Direct file detected → skipping yt-dlp.")
             return url_in
 
@@ -592,46 +827,49 @@ class DownloadTab(QWidget):
                 return kaltura_embed_url(entry_id)
             self.log.append_line("Could not derive entry_id from webtv.un.org")
 
-        elif url_lower.endswith(".un.org") or ".un.org/" in url_lower:
-            resolved = fetch_entry_id_from_html(url_in)
-            if resolved:
-                self.entry_edit.setText(resolved)
-                self._lock_entry_field(True)
-                return kaltura_embed_url(resolved)
-            self.log.append_line("Could not extract entry_id from UN site HTML")
-
-        elif "news.un.org" in url_lower:
-            direct = extract_un_media_file(url_in)
-            if direct:
-                self.log.append_line(f"Resolved UN media file: {direct}")
-                return direct
-            self.log.append_line("Could not extract direct file from UN News page")
-
-        # Generic extractor fallback
-        direct = extract_direct_media_file(url_in)
-        if direct:
-            self.log.append_line(f"Resolved direct media file: {direct}")
-            return direct
+        # HTML probes are independent page fetches: run them concurrently and
+        # take the first hit in priority order
+        probes = []
+        if "webtv.un.org" not in url_lower and (
+                url_lower.endswith(".un.org") or ".un.org/" in url_lower):
+            probes.append(("entry", fetch_entry_id_from_html))
+        if "news.un.org" in url_lower:
+            probes.append(("un", extract_un_media_file))
+        probes.append(("direct", extract_direct_media_file))  # generic fallback
+
+        pool = ThreadPoolExecutor(max_workers=len(probes))
+        futures = [(name, pool.submit(fn, url_in)) for name, fn in probes]
+        try:
+            for name, fut in futures:
+                found = fut.result()
+                if name == "entry":
+                    if found:
+                        self.entry_edit.setText(found)
+                        self._lock_entry_field(True)
+                        return kaltura_embed_url(found)
+                    self.log.append_line("Could not extract entry_id from UN site HTML")
+                elif name == "un":
+                    if found:
+                        self.log.append_line(f"Resolved UN media file: {found}")
+                        return found
+                    self.log.append_line("Could not extract direct file from UN News page")
+                elif found:
+                    self.log.append_line(f"Resolved direct media file: {found}")
+                    return found
+        finally:
+            # don't wait on lower-priority probes once we have an answer
+            pool.shutdown(wait=False, cancel_futures=True)
 
         # yt-dlp cache + fast probe
-        if not hasattr(self, "_url_cache"):
-            self._url_cache = {}
-
-        if url_in in self._url_cache:
+        cached = self._url_cache.get(url_in)
+        if cached:
             self.log.append_line("URL resolved from cache.")
-            return self._url_cache[url_in]
+            return cached
 
         try:
             cmd = [YTDLP, "--get-url", "--no-playlist", "--no-warnings", "--socket-timeout", "6", url_in]
-            startupinfo = None
-            creationflags = 0
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creationflags = subprocess.CREATE_NO_WINDOW
-
             out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True,
-                                          startupinfo=startupinfo, creationflags=creationflags).strip()
+                                          **_NO_CONSOLE).strip()
             if out:
                 resolved = out.splitlines()[0]
                 self._url_cache[url_in] = resolved
@@ -652,14 +890,14 @@ class DownloadTab(QWidget):
             return
 
         self.table.setRowCount(0)
-        self._format_cache[url] = formats
 
         if not formats:
             self.log.append_line("⚠ No formats found.")
             return
 
+        # Filter first, then fill a pre-sized table in one batch
         seen_ids = set()
-        shown = 0
+        rows = []
 
         for f in formats:
             fid = str(f.get("format_id", "")).strip()
@@ -697,165 +935,62 @@ class DownloadTab(QWidget):
                 ftype = "other"
                 info = "unknown"
 
-            # --- Insert row ---
-            row = self.table.rowCount()
-            self.table.insertRow(row)
+            rows.append((fid, ext, ftype, str(info), lang))
 
-            chk = QTableWidgetItem()
-            chk.setFlags(QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled)
-            chk.setCheckState(QtCore.Qt.Unchecked)
-
-            self.table.setItem(row, 0, chk)
-            self.table.setItem(row, 1, QTableWidgetItem(fid))
-            self.table.setItem(row, 2, QTableWidgetItem(ext))
-            self.table.setItem(row, 3, QTableWidgetItem(ftype))
-            self.table.setItem(row, 4, QTableWidgetItem(str(info)))
-            self.table.setItem(row, 5, QTableWidgetItem(lang))
-
-            shown += 1
+        with batched_table_updates(self.table):
+            self.table.setRowCount(len(rows))
+            for row, values in enumerate(rows):
+                chk = QTableWidgetItem()
+                chk.setFlags(QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled)
+                chk.setCheckState(QtCore.Qt.Unchecked)
+                self.table.setItem(row, 0, chk)
+                for col, text in enumerate(values, 1):
+                    self.table.setItem(row, col, QTableWidgetItem(text))
+        shown = len(rows)
 
         self.log.append_line(f"✅ Displayed {shown} of {len(formats)} formats (filtered audio 'und').")   
             
     # TTL cache expiry (optional)
-    def _prune_cache(self, ttl_sec=600):
-        """Safely remove cached format entries older than ttl_sec (default 10 min)."""
-        now = time.time()
-        cleaned = 0
-        for k, v in list(self._format_cache.items()):
-            # Handle both old and new cache formats
-            if isinstance(v, tuple) and len(v) == 2:
-                formats, t = v
-                if now - t > ttl_sec:
-                    del self._format_cache[k]
-                    cleaned += 1
-            elif isinstance(v, list):
-                # Old-style (no timestamp): keep as-is
-                continue
-        if cleaned:
-            self.log.append_line(f"🧹 Pruned {cleaned} expired cache entr{'y' if cleaned==1 else 'ies'}.")
-
     def list_formats(self):
-        for exe in (FFMPEG, FFPROBE, YTDLP):
-            if not os.path.exists(exe):
-                raise FileNotFoundError(
-                    f"Required tool not found: {exe}\n"
-                    "Make sure the 'bin' folder with ffmpeg.exe, ffprobe.exe, and yt-dlp.exe "
-                    "is next to your WebTvMux.exe."
-                )
-        self._prune_cache()
         """Smarter, faster format listing with caching and async support."""
         url = self._resolve_url()
         if not url:
             return
 
-        # Cached results
-        if url in self._format_cache:
+        # Cached results (expired entries drop out on lookup)
+        cached = self._format_cache.get(url)
+        if cached is not None:
             self.log.append_line("Formats served from cache.")
-            self._populate_formats(url, self._format_cache[url])
+            self._last_info = cached["info"]
+            self._populate_formats(url, cached["formats"])
+            return
+
+        # A fetch for this url is already running; its result fills the table
+        if url in self._inflight_formats:
+            self.log.append_line("Format listing already in progress.")
             return
+        self._inflight_formats.add(url)
 
         self.table.setRowCount(0)
         self.log.append_line(f"Listing formats for: {url}")
 
-        # Async format fetcher
-        class FormatWorker(QThread):
-            done = QtCore.Signal(list, str)
-
-            def __init__(self, url: str):
-                super().__init__()
-                self.url = url
-
-            def run(self):
-                try:
-                    cmd = [
-                        YTDLP,
-                        "-J", "--skip-download", "--no-warnings",
-                        "--socket-timeout", "20",
-                        "--extractor-args", "youtube:player_client=android,player_skip=dash=False",
-                        "--format-sort", "res,ext",
-                        "--merge-output-format", "mp4",
-                        "--geo-bypass",
-                        "--no-check-certificates",
-                        "--ignore-errors",
-                        "--compat-options", "manifest-filesize-approx",
-                        "--add-header", "User-Agent: Mozilla/5.0",
-                        self.url
-                    ]
-
-                    startupinfo = None
-                    creationflags = 0
-                    if os.name == "nt":
-                        startupinfo = subprocess.STARTUPINFO()
-                        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                        creationflags = subprocess.CREATE_NO_WINDOW
-
-                    proc = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        startupinfo=startupinfo,
-                        creationflags=creationflags
-                    )
-
-                    try:
-                        # Increased from 10 → 30 seconds to avoid premature timeout
-                        out, err = proc.communicate(timeout=30)
-                    except subprocess.TimeoutExpired:
-                        proc.kill()
-                        self.done.emit([], "Timeout fetching formats (first try) — retrying...")
-                        try:
-                            # Retry once more in case the server was slow
-                            proc = subprocess.Popen(
-                                cmd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                text=True,
-                                startupinfo=startupinfo,
-                                creationflags=creationflags
-                            )
-                            out, err = proc.communicate(timeout=30)
-                        except subprocess.TimeoutExpired:
-                            proc.kill()
-                            self.done.emit([], "Timeout fetching formats (second try).")
-                            return
-
-                    if proc.returncode == 0 and out.strip():
-                        import json
-                        data = json.loads(out)
-                        formats = data.get("formats") or []
-                        if not formats and "entries" in data:
-                            # playlist or single entry fallback
-                            entry = data["entries"][0] if data["entries"] else {}
-                            formats = entry.get("formats", [])
-                        if formats:
-                            self.done.emit(formats, "")
-                        else:
-                            self.done.emit([], "No downloadable formats found. Try updating yt-dlp.")
-                    else:
-                        err_msg = err or f"yt-dlp exited with code {proc.returncode}"
-                        self.done.emit([], err_msg)
-                except subprocess.TimeoutExpired:
-                    self.done.emit([], "Timeout fetching formats")
-                except Exception as e:
-                    self.done.emit([], str(e))
+        # Async format fetch on the shared asyncio loop; the result comes back
+        # to on_done in the GUI thread through a queued signal
+        fetch = _FormatFetch(self)
 
-        def on_done(formats: list, err: str):
+        def on_done(formats: list, info: dict, err: str):
+            fetch.deleteLater()
+            self._inflight_formats.discard(url)
             if err:
                 QMessageBox.critical(self, "Error", f"Could not list formats: {err}")
                 return
-            self._format_cache[url] = formats
+            self._format_cache[url] = {"formats": formats, "info": info}
+            self._last_info = info  # spares start_download a --dump-json run
             self._populate_formats(url, formats)
             self.log.append_line(f"Listed {len(formats)} formats successfully.")
-        worker = FormatWorker(url)
-        worker.done.connect(on_done)
-        worker.start()
-        self.active_threads.append(worker)
-
-    def _cleanup_thread(self, thread: QThread):
-        if thread in self.active_threads:
-            self.active_threads.remove(thread)
-
+        fetch.done.connect(on_done)
+        future = asyncio.run_coroutine_threadsafe(_fetch_formats(url), get_async_loop())
+        future.add_done_callback(fetch.emit_result)
 
     def start_download(self):
         url = self._resolve_url()
@@ -868,12 +1003,10 @@ class DownloadTab(QWidget):
         self.url_edit.setEnabled(False)
         
         # --- NEW: direct file bypass ---
-        if url.lower().endswith((".mp3", ".mp4", ".m4a", ".ogg", ".wav", ".webm")):
+        ext = _url_ext(url)
+        if ext in _DIRECT_EXTS:
             # Decide folder based on type
-            if url.lower().endswith((".mp3", ".m4a", ".ogg", ".wav")):
-                subfolder = "audios"
-            else:
-                subfolder = "videos"
+            subfolder = "audios" if ext in _AUDIO_EXTS else "videos"
 
             # Ensure both audios/ and videos/ always exist
             base_dir = Path(self.dir_edit.text())
@@ -886,7 +1019,8 @@ class DownloadTab(QWidget):
             label = Path(url).name
             opts = {"outtmpl": outtmpl, "format": "bestaudio/best"}
 
-            self._queue = [(url, label, opts)]
+            self._queue.clear()
+            self._queue.append((url, label, opts))
             self.global_status.setText("Direct file detected → downloading…")
             self.log.append_line(f"Direct file queued: {url} → {subfolder}/")
             self.start_btn.setEnabled(False)
@@ -913,23 +1047,34 @@ class DownloadTab(QWidget):
             QMessageBox.warning(self, "Warning", "Please select at least one format to download.")
             return
 
+        # Title for the row labels: from the format listing, else one lookup per batch
+        if not self._last_info:
+            try:
+                # only the title is needed: --print keeps the output to one short line
+                # instead of the multi-MB --dump-json blob; run() kills it on timeout
+                cmd = [YTDLP, "--print", "title", "--playlist-items", "1", "--no-warnings", url]
+                proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      timeout=10, **_NO_CONSOLE)
+                lines = proc.stdout.decode("utf-8", errors="replace").split("\n", 1)
+                if proc.returncode == 0 and lines[0].strip():
+                    self._last_info = {"title": lines[0].strip()}
+            except Exception:
+                self._last_info = {}
+        title = self._last_info.get("title") if self._last_info else None
+        if not title:
+            title = f"download_{datetime.datetime.now().strftime('%H%M%S')}"
+
+        # Resolve the output folder and create its subfolders once per batch
+        base_dir = Path(self.dir_edit.text().strip() or ".").resolve()
+        (base_dir / "audios").mkdir(parents=True, exist_ok=True)
+        (base_dir / "videos").mkdir(parents=True, exist_ok=True)
+        audio_dir = str(base_dir / "audios") + os.sep
+        video_dir = str(base_dir / "videos") + os.sep
+
         # Queue downloads for each selected format
         self._queue.clear()
         for row, fid in selected_formats:
-            outtmpl = self._build_outtmpl_for_row(row)
-            if not self._last_info:
-                try:
-                    cmd = [YTDLP, "--dump-json", url]
-                    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                    info, _ = proc.communicate(timeout=10)
-                    if proc.returncode == 0 and info:
-                        import json
-                        self._last_info = json.loads(info)
-                except Exception:
-                    self._last_info = {}
-            title = self._last_info.get("title") if self._last_info else None
-            if not title:
-                title = f"download_{datetime.datetime.now().strftime('%H%M%S')}"
+            outtmpl = self._build_outtmpl_for_row(row, audio_dir, video_dir)
             label = f"{title} | {fid} | row{row}"
             opts = {
                 "format": fid,
@@ -945,118 +1090,102 @@ class DownloadTab(QWidget):
 
 
     def _start_worker(self):
-        if not self._queue:
-            return
-
-        if self.parallel_chk.isChecked():
-            max_jobs = self.max_jobs_spin.value()
-            while self._queue and len(self._active_rows) < max_jobs:
-                url, label, opts = self._queue.pop(0)
-                self._launch_worker(url, label, opts)
-        else:
-            # Only launch one at a time
-            # Protect against double-call if already running
-            if any(
-                status_item and status_item.text() in ("Downloading…", "Starting…")
-                for row in range(self.active_table.rowCount())
-                for status_item in [self.active_table.item(row, 2)]
-            ):
-                return  # A worker is still running, don't start again
-
-            if self._queue:  # double-check not empty
-                url, label, opts = self._queue.pop(0)
-                self._launch_worker(url, label, opts)
+        """Launch queued jobs while there are free slots ("Max jobs", or 1 when sequential)."""
+        max_jobs = self.max_jobs_spin.value() if self.parallel_chk.isChecked() else 1
+        while self._queue and self._running_count < max_jobs:
+            url, label, opts = self._queue.popleft()
+            self._launch_worker(url, label, opts)
 
     def _launch_worker(self, url, label, opts):
-        row = self.active_table.rowCount()
-        self.active_table.insertRow(row)
-        label_item = QTableWidgetItem(label)
-        label_item.setTextAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)  # align for wrapping
-        self.active_table.setItem(row, 0, label_item)
-        self.active_table.setItem(row, 1, QTableWidgetItem("0%"))
-        self.active_table.setItem(row, 2, QTableWidgetItem("Starting…"))
-        # auto-resize row to fit wrapped text
-        self.active_table.resizeRowToContents(row)
-        self.active_table.resizeRowToContents(row)
-        #self.active_table.resizeColumnsToContents()
-
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(lambda _, lbl=label: self._cancel_single(lbl))
-        self.active_table.setCellWidget(row, 3, cancel_btn)
+        # one repaint for the whole new row
+        with batched_table_updates(self.active_table):
+            row = self.active_table.rowCount()
+            self.active_table.insertRow(row)
+            label_item = QTableWidgetItem(label)
+            label_item.setTextAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)  # align for wrapping
+            self.active_table.setItem(row, 0, label_item)
+            self.active_table.setItem(row, 1, QTableWidgetItem("0%"))
+            self.active_table.setItem(row, 2, QTableWidgetItem("Starting…"))
+            # auto-resize row to fit wrapped text
+            self.active_table.resizeRowToContents(row)
+
+            cancel_btn = QPushButton("Cancel")
+            cancel_btn.clicked.connect(partial(self._cancel_single, label))
+            self.active_table.setCellWidget(row, 3, cancel_btn)
+        self._progress_map[label] = 0
 
+        # worker stays in the GUI thread; its run() executes on a pool thread
+        # and the signals it emits there are queued back to these slots
         worker = DownloadWorker(opts, url, label)
-        thread = QThread()
-        worker.moveToThread(thread)
 
         # wire signals
-        thread.started.connect(worker.run)
         worker.progress.connect(self._on_progress_update)   # (pct, label)
         worker.log.connect(self.log.append_line)
         worker.finished.connect(self._on_worker_finished)   # label
         worker.error.connect(self._on_worker_error)
         worker.cancelled.connect(self._on_worker_cancelled)
-        worker.finished.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        thread.finished.connect(thread.deleteLater)
+        for sig in (worker.finished, worker.error, worker.cancelled):
+            sig.connect(worker.deleteLater)
 
-        self._active_rows[label] = (row, opts["outtmpl"], worker, thread)
-        self.active_threads.append(thread)
+        self._active_rows[label] = (row, opts["outtmpl"], worker)
+        self._running_count += 1
         self.log.append_line(f"▶ Download queued: {label}")
-        # Safe cleanup when thread finishes
-        thread.finished.connect(lambda t=thread: self._cleanup_thread(t))
-        thread.start()
+        self._pool.start(worker.run)
         self.log.append_line(f"⬇️ Worker launched for {label} → download about to begin…")
 
-    def _cancel_single(self, label):
+    def _cancel_single(self, label, *_):
         entry = self._active_rows.get(label)
         if not entry:
             return
-        row, _filepath, worker, _thread = entry
+        row, _filepath, worker = entry
         worker.cancel()
-        self.active_table.setItem(row, 2, QTableWidgetItem("Cancelling…"))
+        self._set_cell(row, 2, "Cancelling…")
         self.log.append_line(f"⏹ Requested cancel for {label}")
 
     @QtCore.Slot(int, str)
     def _on_progress_update(self, pct: int, label: str):
         if label in self._active_rows:
             row, *_ = self._active_rows[label]
-            self.active_table.setItem(row, 1, QTableWidgetItem(f"{pct}%"))
-            self.active_table.setItem(row, 2, QTableWidgetItem("Downloading…"))
-            self.active_table.resizeRowToContents(row)
-
-        # --- aggregate overall progress across all active downloads ---
-        total_active = self.active_table.rowCount()
-        if total_active > 0:
-            pct_sum = 0
-            for row in range(self.active_table.rowCount()):
-                p_item = self.active_table.item(row, 1)
-                if p_item:
-                    try:
-                        val = int(p_item.text().replace("%", ""))
-                    except Exception:
-                        val = 0
-                    pct_sum += val
-            self.progress.setValue(int(pct_sum / total_active))
-            #self.active_table.resizeColumnsToContents()
+            self._set_cell(row, 1, f"{pct}%")
+            status = self.active_table.item(row, 2)
+            if status is None or status.text() != "Downloading…":
+                self._set_cell(row, 2, "Downloading…")
+                self.active_table.resizeRowToContents(row)
+            self._progress_map[label] = pct
+
+        # --- aggregate overall progress across all active downloads (≤10 Hz) ---
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _update_overall_progress(self):
+        if self._progress_map:
+            self.progress.setValue(sum(self._progress_map.values()) // len(self._progress_map))
             
     @QtCore.Slot(str)
     def _on_worker_cancelled(self, label: str):
         if label in self._active_rows:
-            row, outtmpl, worker, _thread = self._active_rows[label]
+            self._running_count -= 1
+            row, outtmpl, worker = self._active_rows[label]
 
             # remove partial files at UI level too (backup cleanup)
+            # one directory listing instead of a stat per candidate suffix
             if outtmpl:
                 base = Path(outtmpl)
-                for ext in ("", ".part", ".ytdl", ".temp"):
-                    cand = base.with_suffix(base.suffix + ext) if base.suffix else Path(str(base) + ext)
-                    if cand.exists():
-                        try:
-                            cand.unlink()
-                            self.log.append_line(f"🗑 Removed partial file: {cand}")
-                        except Exception as e:
-                            self.log.append_line(f"⚠ Could not remove partial file: {cand} ({e})")
-
-            self.active_table.setItem(row, 2, QTableWidgetItem("Cancelled"))
+                prefix = base.stem + "."     # "name." matches name.mp4.part and name.f137.mp4.part
+                try:
+                    leftovers = [p for p in base.parent.iterdir()
+                                 if p.name == base.name
+                                 or (p.name.startswith(prefix) and p.name.endswith((".part", ".ytdl", ".temp")))]
+                except OSError:
+                    leftovers = []
+                for cand in leftovers:
+                    try:
+                        cand.unlink()
+                        self.log.append_line(f"🗑 Removed partial file: {cand}")
+                    except Exception as e:
+                        self.log.append_line(f"⚠ Could not remove partial file: {cand} ({e})")
+
+            self._set_cell(row, 2, "Cancelled")
             self.active_table.resizeRowToContents(row)
 
             self._progress_map.pop(label, None)
@@ -1067,20 +1196,15 @@ class DownloadTab(QWidget):
         self.log.append_line(f"✖ Cancelled: {label}")
 
         # Trigger next jobs for both serial and parallel modes
-        if self._queue:
-            if self.parallel_chk.isChecked():
-                while self._queue and len(self._active_rows) < self.max_jobs_spin.value():
-                    url, label, opts = self._queue.pop(0)
-                    self._launch_worker(url, label, opts)
-            else:
-                self._start_worker()
+        self._start_worker()
         
         
     @QtCore.Slot(str, str)
     def _on_worker_error(self, msg: str, label: str):
         if label in self._active_rows:
+            self._running_count -= 1
             row, *_ = self._active_rows[label]
-            self.active_table.setItem(row, 2, QTableWidgetItem("Error"))
+            self._set_cell(row, 2, "Error")
             self.active_table.resizeRowToContents(row)
 
             # remove from cache so avg progress is correct
@@ -1092,24 +1216,19 @@ class DownloadTab(QWidget):
         self.log.append_line(f"✖ Error: {label} → {msg}")
 
         # Trigger next jobs for both serial and parallel modes
-        if self._queue:
-            if self.parallel_chk.isChecked():
-                while self._queue and len(self._active_rows) < self.max_jobs_spin.value():
-                    url, label, opts = self._queue.pop(0)
-                    self._launch_worker(url, label, opts)
-            else:
-                self._start_worker()
+        self._start_worker()
 
     @QtCore.Slot(str)
     def _on_worker_finished(self, label: str):
         entry = self._active_rows.get(label)
         if entry:
+            self._running_count -= 1
             row, *_ = entry
             last_status = self.active_table.item(row, 2)
             if last_status and "Cancelling" in last_status.text():
-                self.active_table.setItem(row, 2, QTableWidgetItem("Cancelled"))
+                self._set_cell(row, 2, "Cancelled")
             else:
-                self.active_table.setItem(row, 2, QTableWidgetItem("Finished"))
+                self._set_cell(row, 2, "Finished")
             self.active_table.resizeRowToContents(row)
 
             # remove entry completely instead of leaving None
@@ -1117,8 +1236,7 @@ class DownloadTab(QWidget):
 
         # Update aggregate correctly
         self._completed += 1
-        active_count = sum(1 for v in self._active_rows.values() if v)   # only count active
-        remaining = active_count + len(self._queue)
+        remaining = self._running_count + len(self._queue)
         total_done = self._completed
         total = total_done + remaining
         percent = int(total_done / max(1, total) * 100)
@@ -1126,13 +1244,7 @@ class DownloadTab(QWidget):
         self.global_status.setText(f"Completed {total_done}/{total}")
 
         # NEW: trigger next jobs for both serial and parallel modes
-        if self._queue:
-            if self.parallel_chk.isChecked():
-                while self._queue and len(self._active_rows) < self.max_jobs_spin.value():
-                    url, label, opts = self._queue.pop(0)
-                    self._launch_worker(url, label, opts)
-            else:
-                self._start_worker()
+        self._start_worker()
 
         # Re-enable URL if no active downloads left
         if not self._active_rows and not self._queue:
@@ -1157,12 +1269,7 @@ class DownloadTab(QWidget):
         # Open the output directory instead.
         folder = Path(outtmpl).parent
         try:
-            if QtCore.QSysInfo.productType().lower().startswith("windows"):
-                os.startfile(folder)  # type: ignore
-            elif QtCore.QSysInfo.productType().lower() == "osx":
-                subprocess.Popen(["open", str(folder)])
-            else:
-                subprocess.Popen(["xdg-open", str(folder)])
+            _open_folder(str(folder))
         except Exception as e:
             QMessageBox.critical(self, "Open Error", f"Could not open folder:\n{e}")
 
@@ -1190,6 +1297,12 @@ class DownloadTab(QWidget):
         if not text.strip():
             self._lock_entry_field(False)
             
+    def _on_url_settled(self):
+        text = self.url_edit.text()
+        self._on_url_changed(text)
+        if text.strip():
+            self._auto_handle_url(text)
+
     def _on_url_changed(self, _text: str):
         # Always clear the format list + active downloads table on new URL
         self.table.setRowCount(0)          # clear format list
@@ -1197,6 +1310,8 @@ class DownloadTab(QWidget):
         self._last_info = None
         self._queue.clear()
         self._active_rows.clear()
+        self._running_count = 0
+        self._progress_map.clear()
         self._completed = 0
         self.global_status.setText("Ready for new download")
 
@@ -1228,7 +1343,7 @@ class DownloadTab(QWidget):
         self._last_resolved_url = url
 
         # Direct file → start download immediately
-        if url.lower().endswith((".mp3", ".mp4", ".m4a", ".ogg", ".wav", ".webm")):
+        if _url_ext(url) in _DIRECT_EXTS:
             self.start_btn.setEnabled(False)   # grey out Download button
             self.start_download()
         else:
@@ -1241,22 +1356,15 @@ class DownloadTab(QWidget):
         item = self.table.item(row, 3)
         return (item.text().strip().lower() if item else "video")
 
-    def _build_outtmpl_for_row(self, row: int) -> str:
-        base_dir = Path(self.dir_edit.text().strip() or ".")
-        ftype = self._row_type(row)
-
-        if ftype == "audio":
+    def _build_outtmpl_for_row(self, row: int, audio_dir: str, video_dir: str) -> str:
+        """audio_dir/video_dir: resolved, existing folders ending in os.sep."""
+        if self._row_type(row) == "audio":
             lang_item = self.table.item(row, 5)
             lang = lang_item.text().strip().lower() if lang_item and lang_item.text().strip() else "und"
-            sub = "audios"
-            pat = f"%(title)s_{lang}_row{row}.%(ext)s"
-        else:
-            res_item = self.table.item(row, 4)
-            res = (res_item.text() if res_item else "").replace(" ", "_").lower()
-            sub = "videos"
-            pat = f"%(title)s_{res}_row{row}.%(ext)s"
-        (base_dir / sub).mkdir(parents=True, exist_ok=True) 
-        return str((base_dir / sub / pat).resolve())
+            return f"{audio_dir}%(title)s_{lang}_row{row}.%(ext)s"
+        res_item = self.table.item(row, 4)
+        res = (res_item.text() if res_item else "").replace(" ", "_").lower()
+        return f"{video_dir}%(title)s_{res}_row{row}.%(ext)s"
 
 
 # Optional: quick manual test harness
@@ -1266,6 +1374,8 @@ if __name__ == "__main__":
     class DummySettings:
         def __init__(self):
             self.data = {"default_lang": "eng", "last_output_dir": {"download": str(Path.cwd())}}
+        def set_out_dir(self, key, value):
+            self.data["last_output_dir"][key] = value
     w = DownloadTab(DummySettings())
     w.setWindowTitle("DownloadTab Test Harness")
     w.resize(1000, 600)
@@ -1,9 +1,12 @@
 from pathlib import Path
-from typing import List, Dict
-import subprocess, json, datetime, re, sys, os
+from typing import List, Dict, Set
+import subprocess, json, datetime, sys, os, threading, queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 from PySide6 import QtCore, QtWidgets
-from PySide6.QtCore import QThread, Qt
+from PySide6.QtCore import QThread, Qt, QStringListModel
 from PySide6.QtCore import QFileSystemWatcher
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -13,7 +16,8 @@ from PySide6.QtWidgets import (
 )
 
 from utils import LANGS_639_2, normalize_lang_code, FFMPEG, FFPROBE, lang_for_mux, load_languages, CONFIG_DIR
-from utils import verify_tools
+from utils import verify_tools, terminate_process, join_thread, batched_table_updates
+from utils import cached_probe, store_probe, save_probe_cache
 verify_tools()
 
 INSTALL_DIR = str(Path(sys.argv[0]).resolve().parent)
@@ -26,40 +30,66 @@ if sys.platform == "win32":
     STARTUPINFO = subprocess.STARTUPINFO()
     STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
     
-# ---- ffprobe cache ----
-_ffprobe_cache: dict[str, dict] = {}
+def probe_file(path: str, timeout: float = 10.0) -> dict:
+    """Probe a media file with ffprobe and cache results (persisted by save_probe_cache).
 
-def probe_file(path: str) -> dict:
-    """Probe a media file with ffprobe and cache results in memory (streams + duration)."""
-    if path in _ffprobe_cache:
-        return _ffprobe_cache[path]
+    Raises subprocess.TimeoutExpired if ffprobe runs longer than timeout seconds.
+    """
+    info = cached_probe("mux", path)
+    if info is not None:
+        return info
 
     cmd = [
         FFPROBE, "-v", "error",
+        # stream list/codecs/tags come from the headers: don't analyse media data
+        "-probesize", "1000000", "-analyzeduration", "100000",
         "-show_entries",
         "format=duration:stream=index,codec_type,codec_name:stream_tags=language,title:stream_disposition=default",
         "-of", "json", path
     ]
-    proc = subprocess.Popen(
+    # Raw bytes: json.loads parses them directly, no text decode pass.
+    # run() also kills and reaps ffprobe if it hits the timeout.
+    proc = subprocess.run(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
+        timeout=timeout,
         startupinfo=STARTUPINFO,
         creationflags=CREATE_NO_WINDOW
     )
-    out, err = proc.communicate(timeout=6)
     if proc.returncode != 0:
-        raise RuntimeError(f"ffprobe failed for {path}: {err.strip() or proc.returncode}")
+        err = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffprobe failed for {path}: {err or proc.returncode}")
 
     try:
-        info = json.loads(out or "{}")
+        info = json.loads(proc.stdout or b"{}")
     except Exception:
-        info = {}
+        return {}  # not cached: a bad parse would otherwise stick until the file changes
 
-    _ffprobe_cache[path] = info
+    store_probe("mux", path, info)
     return info
 
+# ---------- Tool warm-up ----------
+_warmup_started = False
+
+def _warm_up_tools():
+    """Run `-version` once per tool in the background so the first real probe or
+    mux doesn't pay the cold start (binary load, DLL resolution, AV scan)."""
+    global _warmup_started
+    if _warmup_started:
+        return
+    _warmup_started = True
+
+    def _run():
+        for exe in (FFPROBE, FFMPEG):
+            try:
+                subprocess.run([exe, "-version"], stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, timeout=3,
+                               startupinfo=STARTUPINFO, creationflags=CREATE_NO_WINDOW)
+            except Exception:
+                pass
+    threading.Thread(target=_run, name="tool-warmup", daemon=True).start()
+
 # ---------- Logging widget ----------
 class LogView(QTextEdit):
     def __init__(self):
@@ -91,67 +121,132 @@ def load_languages(path: Path) -> Dict[str, str]:
         base["und"] = "Undetermined"
     return base
 
+# Input suffixes picked up by "Add Folder"
+_MEDIA_EXTS = frozenset((".mp4", ".mkv", ".mov", ".mp3", ".aac", ".wav", ".flac"))
+
 # ---------- Guess language from filename ----------
+@lru_cache(maxsize=1024)
+def _filename_lang_token(path: str):
+    """First 2-3 letter a-z token after a '_', '-' or '.' in the file stem, else None.
+    Plain string splitting; the same paths come back on every rescan and mux."""
+    tokens = Path(path).stem.lower().replace("-", "_").replace(".", "_").split("_")
+    for tok in tokens[1:]:  # the first token has no separator before it
+        if 2 <= len(tok) <= 3 and tok.isascii() and tok.isalpha():
+            return tok
+    return None
+
 def guess_lang_from_filename(path: str, default_lang: str = "eng") -> str:
-    name = Path(path).stem.lower()
-    m = re.search(r'[_\-.]([a-z]{2,3})(?:[_\-.]|$)', name)
-    if m:
-        return normalize_lang_code(m.group(1), default_lang)
+    tok = _filename_lang_token(path)
+    if tok:
+        return normalize_lang_code(tok, default_lang)
     return default_lang
     
 class _ProbeWorker(QtCore.QThread):
+    """One long-lived probe thread per MuxTab: submit() queues a file list and
+    run() works through the queue, so each scan reuses the thread and its
+    signal connections."""
     progress = QtCore.Signal(int)           # 0-100
     result = QtCore.Signal(int, dict)       # (file_index, info_json)
     error = QtCore.Signal(int, str)         # (file_index, message)
     finished_all = QtCore.Signal()
 
-    def __init__(self, files, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.files = list(files)
+        self._jobs: "queue.Queue[tuple | None]" = queue.Queue()
         self._stop = False
 
+    def submit(self, files, timeout=10.0):
+        self._jobs.put((list(files), timeout))
+
     def stop(self):
         self._stop = True
+        self._jobs.put(None)  # wake run() if it is waiting for a batch
+
+    @staticmethod
+    def _probe_one(i, fpath, timeout):
+        try:
+            return i, probe_file(fpath, timeout), None
+        except Exception as e:
+            return i, None, str(e)
 
     def run(self):
-        total = max(1, len(self.files))
-        for i, fpath in enumerate(self.files):
-            if self._stop:
+        while not self._stop:
+            job = self._jobs.get()
+            if job is None or self._stop:
                 break
-
-            try:
-                info = probe_file(fpath)
-                self.result.emit(i, info)
-            except Exception as e:
-                self.error.emit(i, str(e))
-
-            self.progress.emit(int((i + 1) * 100 / total))
-        # Emit once when the loop completes (or stops)
+            self._run_batch(*job)
+
+    def _run_batch(self, files, timeout):
+        total = max(1, len(files))
+        # ffprobe runs are independent subprocesses: probe files concurrently,
+        # but emit results in file order so stream rows stay grouped by file
+        workers = max(1, min(8, os.cpu_count() or 4, len(files)))
+        pending = {}
+        next_i = 0
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._probe_one, i, f, timeout) for i, f in enumerate(files)]
+            for fut in as_completed(futures):
+                if self._stop:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+                i, info, err = fut.result()
+                pending[i] = (info, err)
+                while next_i in pending:
+                    info, err = pending.pop(next_i)
+                    if err is None:
+                        self.result.emit(next_i, info)
+                    else:
+                        self.error.emit(next_i, err)
+                    next_i += 1
+                done += 1
+                self.progress.emit(int(done * 100 / total))
+        # Emit once when the batch completes (or stops)
         self.finished_all.emit()
         
 class _MuxWorker(QtCore.QThread):
     success = QtCore.Signal()
     failed = QtCore.Signal(str)
+    log_line = QtCore.Signal(str)           # one ffmpeg stderr line
+    progress = QtCore.Signal(int)           # 0-99, from -progress out_time_us
 
-    def __init__(self, cmd, parent=None):
+    def __init__(self, cmd, total_us=0, parent=None):
         super().__init__(parent)
         self.cmd = cmd
+        self.total_us = total_us            # longest input, 0 if unknown
+        self._proc = None
+
+    def stop(self):
+        terminate_process(self._proc)
 
     def run(self):
-        for exe in (FFMPEG, FFPROBE):
-            if not os.path.exists(exe):
-                raise FileNotFoundError(
-                    f"Required tool not found: {exe}\n"
-                    "Make sure the 'bin' folder with ffmpeg.exe, ffprobe.exe, and yt-dlp.exe "
-                    "is next to your WebTvMux.exe."
-                )
+        # the tools were checked once by verify_tools() at import
         try:
-            # Use Popen so we could later parse progress if desired
-            proc = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, startupinfo=STARTUPINFO, creationflags=CREATE_NO_WINDOW)
-            # We keep it simple: wait until done; no GUI blocking since we're in a thread
-            _, err = proc.communicate()
+            proc = self._proc = subprocess.Popen(
+                self.cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                text=True, encoding="utf-8", errors="replace",
+                startupinfo=STARTUPINFO, creationflags=CREATE_NO_WINDOW)
+            # Stream stderr instead of buffering it all; keep only the tail for errors.
+            # "-progress pipe:2" interleaves key=value lines (no spaces) with the log.
+            tail = deque(maxlen=200)
+            last_pct = -1
+            for line in proc.stderr:
+                line = line.rstrip()
+                if not line:
+                    continue
+                if "=" in line and " " not in line:
+                    key, _, value = line.partition("=")
+                    if key == "out_time_us" and self.total_us > 0 and value.isdigit():
+                        pct = min(99, int(value) * 100 // self.total_us)
+                        if pct != last_pct:
+                            last_pct = pct
+                            self.progress.emit(pct)
+                    continue
+                tail.append(line)
+                self.log_line.emit(line)
+            proc.wait()
             if proc.returncode != 0:
-                raise RuntimeError(err.strip() or f"ffmpeg exited {proc.returncode}")
+                raise RuntimeError("\n".join(tail) or f"ffmpeg exited {proc.returncode}")
             self.success.emit()
         except Exception as e:
             self.failed.emit(str(e))
@@ -164,7 +259,11 @@ class MuxTab(QWidget):
     def __init__(self, settings):
         super().__init__()
         self.settings = settings
+        _warm_up_tools()
         self.lang_map: Dict[str, str] = load_languages(CONFIG_DIR / "languages.json")
+        self._refresh_lang_lookups()
+        # One list model backs every stream row's language dropdown
+        self._lang_model = QStringListModel(self._lang_values, self)
         
         # Auto-watch languages.json for changes
         self.lang_watcher = QFileSystemWatcher()
@@ -177,6 +276,7 @@ class MuxTab(QWidget):
         self.reload_lang_btn = QPushButton("Reload Languages")
         self.reload_lang_btn.clicked.connect(self.reload_languages)
         self.files: List[str] = []
+        self._files_set: Set[str] = set()  # same paths as self.files, for O(1) dedup
 
         # File list + controls
         self.file_table = QTableWidget(0, 1)
@@ -275,6 +375,20 @@ class MuxTab(QWidget):
         self.up_btn.clicked.connect(self.move_up)
         self.down_btn.clicked.connect(self.move_down)
         self.scan_btn.clicked.connect(self.detect_tracks)
+
+        # File-list edits restart this timer so a burst of them triggers one scan
+        self._detect_timer = QtCore.QTimer(self)
+        self._detect_timer.setSingleShot(True)
+        self._detect_timer.setInterval(200)
+        self._detect_timer.timeout.connect(self.detect_tracks)
+
+        # Probe thread lives as long as the tab; detect_tracks() only submits batches
+        self._probe_worker = _ProbeWorker(self)
+        self._probe_worker.progress.connect(self.progress_bar.setValue)
+        self._probe_worker.result.connect(self._add_stream_rows)
+        self._probe_worker.error.connect(self._on_probe_error)
+        self._probe_worker.finished_all.connect(self._on_probe_done)
+        self._probe_worker.start()
         self.out_btn.clicked.connect(lambda: self.pick_file(self.out_edit, save=True))
         self.start_btn.clicked.connect(self.do_mux)
         
@@ -284,6 +398,15 @@ class MuxTab(QWidget):
         out_dir = lod.get("mux") or INSTALL_DIR   # (mux tab example)
         self.out_edit.setText(out_dir)   
 
+    def _refresh_lang_lookups(self):
+        """Rebuild the dropdown list, name->position index and name->code map from lang_map."""
+        self._lang_values: List[str] = list(self.lang_map.values())
+        self._lang_index: Dict[str, int] = {v: i for i, v in enumerate(self._lang_values)}
+        # first code wins when two codes share a display name (as the old linear scan did)
+        self._lang_name_to_code: Dict[str, str] = {}
+        for k, v in self.lang_map.items():
+            self._lang_name_to_code.setdefault(v, k)
+
     # ----- File list helpers -----
     
     def _any_stream_selected(self) -> bool:
@@ -298,8 +421,12 @@ class MuxTab(QWidget):
         """Enable Start only when at least one stream is selected."""
         self.start_btn.setEnabled(self._any_stream_selected())
 
+    def _schedule_detect(self):
+        self._detect_timer.start()
+
     def _add_file(self, f: str):
-        if f not in self.files:
+        if f not in self._files_set:
+            self._files_set.add(f)
             self.files.append(f)
             row = self.file_table.rowCount()
             self.file_table.insertRow(row)
@@ -313,17 +440,19 @@ class MuxTab(QWidget):
         for f in files:
             self._add_file(f)
         # auto-rescan after adding
-        self.detect_tracks()
+        self._schedule_detect()
 
     def add_folder_dialog(self):
         folder = QFileDialog.getExistingDirectory(self, "Select folder")
         if folder:
-            folder_path = Path(folder)
-            for ext in ("*.mp4", "*.mkv", "*.mov", "*.mp3", "*.aac", "*.wav", "*.flac"):
-                for f in folder_path.glob(ext):
-                    self._add_file(str(f))
+            # one directory pass instead of a glob per extension
+            with os.scandir(folder) as it:
+                paths = sorted(e.path for e in it
+                               if e.is_file() and os.path.splitext(e.name)[1].lower() in _MEDIA_EXTS)
+            for f in paths:
+                self._add_file(f)
             # auto-rescan after adding
-            self.detect_tracks()
+            self._schedule_detect()
 
 
     def remove_selected(self):
@@ -331,28 +460,44 @@ class MuxTab(QWidget):
         for r in rows:
             self.file_table.removeRow(r)
             if 0 <= r < len(self.files):
-                self.files.pop(r)
-        self.detect_tracks()
+                self._files_set.discard(self.files.pop(r))
+        self._schedule_detect()
 
     def move_up(self):
         r = self.file_table.currentRow()
         if r > 0:
             self.files[r-1], self.files[r] = self.files[r], self.files[r-1]
-            text = self.file_table.item(r, 0).text()
-            self.file_table.item(r, 0).setText(self.file_table.item(r-1, 0).text())
-            self.file_table.item(r-1, 0).setText(text)
+            self._repaint_file_table()
             self.file_table.setCurrentCell(r-1, 0)
-            self.detect_tracks()
+            self._rebuild_streams_from_cache()
 
     def move_down(self):
         r = self.file_table.currentRow()
         if r < self.file_table.rowCount() - 1 and r >= 0:
             self.files[r+1], self.files[r] = self.files[r], self.files[r+1]
-            text = self.file_table.item(r, 0).text()
-            self.file_table.item(r, 0).setText(self.file_table.item(r+1, 0).text())
-            self.file_table.item(r+1, 0).setText(text)
+            self._repaint_file_table()
             self.file_table.setCurrentCell(r+1, 0)
-            self.detect_tracks()
+            self._rebuild_streams_from_cache()
+
+    def _repaint_file_table(self):
+        """Show self.files in the file table, reusing the existing items."""
+        with batched_table_updates(self.file_table):
+            for row, f in enumerate(self.files):
+                item = self.file_table.item(row, 0)
+                if item is not None:
+                    item.setText(Path(f).name)
+
+    def _rebuild_streams_from_cache(self):
+        """Re-render the streams table in file order from cached probes; a reorder
+        doesn't need ffprobe. Falls back to a rescan if any file isn't cached."""
+        infos = [cached_probe("mux", f) for f in self.files]
+        if any(info is None for info in infos):
+            self._schedule_detect()
+            return
+        self.streams_table.setRowCount(0)
+        for fi, info in enumerate(infos):
+            self._add_stream_rows(fi, info)
+        self.streams_table.resizeRowsToContents()
 
     def pick_file(self, widget: QLineEdit, save=False):
         if save:
@@ -367,6 +512,7 @@ class MuxTab(QWidget):
     def clear_all(self):
         # Clear file list
         self.files.clear()
+        self._files_set.clear()
         self.file_table.setRowCount(0)
 
         # Clear streams table
@@ -386,70 +532,51 @@ class MuxTab(QWidget):
                 
     def cleanup_on_exit(self):
         # stop probe worker
-        if hasattr(self, "_probe_worker") and self._probe_worker:
-            try:
-                self._probe_worker.stop()
-                self._probe_worker.quit()
-                self._probe_worker.wait()
-            except Exception:
-                pass
+        if self._probe_worker:
+            self._probe_worker.stop()
+            join_thread(self._probe_worker)
             self._probe_worker = None
-        # stop mux worker
+        # stop mux worker (and its ffmpeg child)
         if hasattr(self, "_mux_worker") and self._mux_worker:
-            try:
-                self._mux_worker.quit()
-                self._mux_worker.wait()
-            except Exception:
-                pass
+            self._mux_worker.stop()
+            join_thread(self._mux_worker)
             self._mux_worker = None
+        save_probe_cache()
 
     # ----- Detect streams -----
-    def detect_tracks(self):
-        # Clear old rows and run probe in background
-        self.streams_table.setRowCount(0)
-        if not self.files:
+    def _add_stream_rows(self, fi: int, info: dict):
+        """Append the audio/video stream rows for file index fi."""
+        streams = [s for s in (info or {}).get("streams", [])
+                   if s.get("codec_type") in ("audio", "video")]
+        if not streams:
             return
-
-        self.log.append_line("Scanning tracks… (non-blocking)")
-        self.progress_bar.setRange(0, 100)
-        self.progress_bar.setValue(0)
-
-        # Disable buttons during scan
-        for btn in (self.add_btn, self.add_folder_btn, self.rm_btn, self.up_btn, self.down_btn, self.scan_btn, self.start_btn):
-            btn.setEnabled(False)
-
-        self._probe_worker = _ProbeWorker(self.files, self)
-        self._probe_worker.progress.connect(self.progress_bar.setValue)
-
-        def _on_result(fi, info):
-            streams = (info or {}).get("streams", [])
-            fpath = self.files[fi]
-            for s in streams:
+        fpath = self.files[fi]
+        fname = Path(fpath).name
+        # one relayout per file: allocate its rows up front, fill them with updates off
+        r0 = self.streams_table.rowCount()
+        with batched_table_updates(self.streams_table):
+            self.streams_table.setRowCount(r0 + len(streams))
+            default_lang = self.settings.data.get("default_lang", "eng")
+            fname_code = guess_lang_from_filename(fpath, default_lang)
+            norm_code = normalize_lang_code(fname_code, default_lang)
+            lang_name = self.lang_map.get(norm_code, self.lang_map.get("und", "Undetermined"))
+            lang_idx = self._lang_index.get(lang_name)
+            for row, s in enumerate(streams, r0):
                 stype = s.get("codec_type")
-                if stype not in ("audio", "video"):
-                    continue
-                row = self.streams_table.rowCount()
-                self.streams_table.insertRow(row)
 
                 chk = QCheckBox(); chk.setChecked(True)
                 self.streams_table.setCellWidget(row, 0, chk)
                 self.streams_table.setItem(row, 1, QTableWidgetItem(str(fi)))
-                item = QTableWidgetItem(Path(fpath).name)
+                item = QTableWidgetItem(fname)
                 item.setTextAlignment(Qt.AlignLeft | Qt.AlignTop)
                 self.streams_table.setItem(row, 2, item)
                 self.streams_table.setItem(row, 3, QTableWidgetItem(str(s.get("index"))))
                 self.streams_table.setItem(row, 4, QTableWidgetItem(stype))
                 self.streams_table.setItem(row, 5, QTableWidgetItem(s.get("codec_name", "")))
 
-                fname_code = guess_lang_from_filename(fpath, self.settings.data.get("default_lang", "eng"))
-                norm_code = normalize_lang_code(fname_code, self.settings.data.get("default_lang", "eng"))
-                lang_name = self.lang_map.get(norm_code, self.lang_map.get("und", "Undetermined"))
-                combo = QComboBox(); combo.addItems(list(self.lang_map.values()))
-                try:
-                    idx = list(self.lang_map.values()).index(lang_name)
-                    combo.setCurrentIndex(idx)
-                except ValueError:
-                    pass
+                combo = QComboBox(); combo.setModel(self._lang_model)
+                if lang_idx is not None:
+                    combo.setCurrentIndex(lang_idx)
                 combo.setEnabled(stype == "audio")
                 self.streams_table.setCellWidget(row, 6, combo)
 
@@ -457,23 +584,42 @@ class MuxTab(QWidget):
                 self.streams_table.setItem(row, 7, QTableWidgetItem(title))
                 disp_default = s.get("disposition", {}).get("default", 0)
                 self.streams_table.setItem(row, 8, QTableWidgetItem("yes" if disp_default else ""))
-            self.streams_table.resizeRowsToContents()
 
-        def _on_error(fi, msg):
-            self.log.append_line(f"ffprobe failed for {self.files[fi]}: {msg}")
+    def _on_probe_error(self, fi: int, msg: str):
+        self.log.append_line(f"ffprobe failed for {self.files[fi]}: {msg}")
 
-        def _on_done():
-            self.progress_bar.setValue(100)
-            for btn in (self.add_btn, self.add_folder_btn, self.rm_btn, self.up_btn, self.down_btn, self.scan_btn, self.start_btn):
-                btn.setEnabled(True)
-            self.log.append_line("Track detection finished.")
-            self._probe_worker = None
+    def _on_probe_done(self):
+        self.streams_table.resizeRowsToContents()  # once, after every file is in
+        self.progress_bar.setValue(100)
+        for btn in (self.add_btn, self.add_folder_btn, self.rm_btn, self.up_btn, self.down_btn, self.scan_btn, self.start_btn):
+            btn.setEnabled(True)
+        self.log.append_line("Track detection finished.")
 
-        self._probe_worker.result.connect(_on_result)
-        self._probe_worker.error.connect(_on_error)
-        self._probe_worker.finished_all.connect(_on_done)
-        self._probe_worker.start()
+    def detect_tracks(self):
+        self._detect_timer.stop()  # a pending auto-rescan is covered by this one
+        # Clear old rows and run probe in background
+        self.streams_table.setRowCount(0)
+        if not self.files:
+            return
 
+        self.log.append_line("Scanning tracks… (non-blocking)")
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+
+        # Disable buttons during scan
+        for btn in (self.add_btn, self.add_folder_btn, self.rm_btn, self.up_btn, self.down_btn, self.scan_btn, self.start_btn):
+            btn.setEnabled(False)
+
+        self._probe_worker.submit(self.files, self._probe_timeout())
+
+
+    def _probe_timeout(self) -> float:
+        """The ffprobe_timeout setting in seconds; 10.0 if it isn't a positive number."""
+        try:
+            timeout = float(self.settings.data.get("ffprobe_timeout", 10.0))
+        except (TypeError, ValueError):
+            return 10.0
+        return timeout if 0 < timeout < float("inf") else 10.0
 
     # ----- Mux command -----
     def do_mux(self):
@@ -496,7 +642,8 @@ class MuxTab(QWidget):
             QMessageBox.warning(self, "Mux", "Please add input files")
             return
 
-        cmd = [FFMPEG]
+        # machine-readable progress on stderr, without the stats ticker
+        cmd = [FFMPEG, "-nostats", "-progress", "pipe:2"]
         for f in self.files:
             cmd.extend(["-i", f])
 
@@ -516,7 +663,7 @@ class MuxTab(QWidget):
                 fpath = self.streams_table.item(r, 2).text()
                 fname_code = guess_lang_from_filename(fpath, self.settings.data.get("default_lang", "eng"))
                 lang_name = self.streams_table.cellWidget(r, 6).currentText()
-                dropdown_code = next((k for k, v in self.lang_map.items() if v == lang_name), fname_code)
+                dropdown_code = self._lang_name_to_code.get(lang_name, fname_code)
                 norm_code = normalize_lang_code(dropdown_code, self.settings.data.get("default_lang", "eng"))
                 mux_code = lang_for_mux(norm_code)   # floor → ina
                 meta.extend([f"-metadata:s:a:{a_out_index}", f"language={mux_code}"])
@@ -532,10 +679,27 @@ class MuxTab(QWidget):
         cmd.extend(meta)
         cmd.extend(["-map_metadata", "-1", "-c", "copy", o])
 
-        self.progress_bar.setRange(0, 0)  # indeterminate while running
+        # Output runs as long as the longest input. probe_file answers from the probe
+        # cache filled by the scan; it only runs ffprobe for an input that was evicted.
+        total_us = 0
+        timeout = self._probe_timeout()
+        for f in self.files:
+            try:
+                dur = float(probe_file(f, timeout).get("format", {}).get("duration") or 0)
+            except Exception:
+                dur = 0.0
+            total_us = max(total_us, int(dur * 1_000_000))
+
+        if total_us > 0:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(0)
+        else:
+            self.progress_bar.setRange(0, 0)  # indeterminate while running
         self.start_btn.setEnabled(False)
 
-        self._mux_worker = _MuxWorker(cmd, self)
+        self._mux_worker = _MuxWorker(cmd, total_us, self)
+        self._mux_worker.log_line.connect(self.log.append_line)
+        self._mux_worker.progress.connect(self.progress_bar.setValue)
         def _done_ok():
             self.progress_bar.setRange(0, 100)
             self.progress_bar.setValue(100)
@@ -563,17 +727,17 @@ class MuxTab(QWidget):
 
         old_count = len(self.lang_map)
         self.lang_map = new_map
+        self._refresh_lang_lookups()
         self.log.append_line(f"✅ Reloaded {len(new_map)} languages (was {old_count}).")
 
-        # Refresh existing dropdowns in the streams table
-        for row in range(self.streams_table.rowCount()):
-            widget = self.streams_table.cellWidget(row, 6)
-            if isinstance(widget, QComboBox):
-                current = widget.currentText()
-                widget.clear()
-                widget.addItems(list(self.lang_map.values()))
-                # Keep the previous language selected if still valid
-                if current in self.lang_map.values():
-                    widget.setCurrentText(current)
-                else:
-                    widget.setCurrentText(self.lang_map.get("eng", "English"))
+        # The dropdowns share _lang_model: remember each selection, swap the
+        # list once, then restore the selections
+        combos = [w for w in (self.streams_table.cellWidget(row, 6)
+                              for row in range(self.streams_table.rowCount()))
+                  if isinstance(w, QComboBox)]
+        currents = [w.currentText() for w in combos]
+        self._lang_model.setStringList(self._lang_values)
+        fallback = self._lang_index.get(self.lang_map.get("eng", "English"), 0)
+        for widget, current in zip(combos, currents):
+            # Keep the previous language selected if still valid
+            widget.setCurrentIndex(self._lang_index.get(current, fallback))
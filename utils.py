@@ -1,12 +1,20 @@
-import os, sys, json, re, subprocess
+import os, sys, json, re, subprocess, copy, time, shutil, threading, asyncio
+from collections import OrderedDict
+from functools import lru_cache
+from contextlib import contextmanager
 from pathlib import Path
+from types import MappingProxyType
+
+from PySide6.QtCore import QSettings, QStandardPaths
 
 # ---------- Base Directories ----------
+_FROZEN = getattr(sys, "frozen", False)  # PyInstaller build
+
 def get_base_dir() -> Path:
     """
     Return the correct base directory for both development and frozen builds.
     """
-    if getattr(sys, "frozen", False):
+    if _FROZEN:
         return Path(sys.executable).parent  # EXE mode
     else:
         return Path(__file__).resolve().parent  # ✅ dev mode = same folder as utils.py
@@ -16,16 +24,26 @@ BIN_DIR = BASE_DIR / "bin"
 CONFIG_DIR = BASE_DIR / "config"
 
 # ---------- Executable Resolution ----------
+@lru_cache(maxsize=1)
+def _bin_dir_files() -> frozenset:
+    """Names of the files in BIN_DIR, listed once (empty if the folder is missing)."""
+    try:
+        with os.scandir(BIN_DIR) as it:
+            return frozenset(e.name for e in it if e.is_file())
+    except OSError:
+        return frozenset()
+
+@lru_cache(maxsize=None)
 def get_bin_path(tool: str) -> str:
     """
     Locate ffmpeg/ffprobe/yt-dlp executables from the bin folder.
     Works in both dev and app modes, and falls back to PATH if missing.
     """
     exe_name = f"{tool}.exe" if os.name == "nt" else tool
-    exe_path = BIN_DIR / exe_name
-    if exe_path.exists():
-        return str(exe_path)
-    return tool  # fallback to PATH if not found
+    if exe_name in _bin_dir_files():
+        return os.path.join(BIN_DIR, exe_name)
+    # resolve the PATH fallback once so each spawn doesn't search PATH again
+    return shutil.which(tool) or tool  # fallback to PATH if not found
 
 FFMPEG = get_bin_path("ffmpeg")
 FFPROBE = get_bin_path("ffprobe")
@@ -42,13 +60,45 @@ def no_console_flags():
         creationflags = subprocess.CREATE_NO_WINDOW
     return {"startupinfo": startupinfo, "creationflags": creationflags}
 
+# ---------- Shutdown Helpers ----------
+def terminate_process(proc, timeout: float = 2.0):
+    """Terminate a child process and reap it, killing it if it ignores SIGTERM."""
+    if proc is None or proc.poll() is not None:
+        return
+    try:
+        proc.terminate()
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    except Exception:
+        pass
+
+
+def join_thread(thread, timeout_ms: int = 3000):
+    """Ask a QThread to stop and wait (bounded) for it to finish."""
+    try:
+        thread.requestInterruption()
+        thread.quit()
+        thread.wait(timeout_ms)
+    except Exception:
+        pass  # already deleted on the C++ side
+
 # ---------- Verify Tool Presence ----------
+@lru_cache(maxsize=None)
+def tool_present(exe: str) -> bool:
+    """Check each tool once per process: bundled tools against the BIN_DIR listing,
+    anything else with a stat, bare names (PATH fallback) on PATH."""
+    if os.path.dirname(exe) == str(BIN_DIR):
+        return os.path.basename(exe) in _bin_dir_files()
+    return os.path.exists(exe) or shutil.which(exe) is not None
+
 def verify_tools():
     """
     Ensure required executables exist.
     Works in both development and EXE environments.
     """
-    missing = [exe for exe in (FFMPEG, FFPROBE, YTDLP) if not os.path.exists(exe)]
+    missing = [exe for exe in (FFMPEG, FFPROBE, YTDLP) if not tool_present(exe)]
     if missing:
         missing_list = "\n".join(missing)
         raise FileNotFoundError(
@@ -63,8 +113,8 @@ def build_path_with_suffix(base: str, suffix: str) -> str:
     Return a new file path by adding suffix before the extension.
     Example: 'video.mp4' + '_1080p' -> 'video_1080p.mp4'
     """
-    p = Path(base)
-    return str(p.with_name(p.stem + suffix + p.suffix))
+    root, ext = os.path.splitext(base)
+    return f"{root}{suffix}{ext}"
 
 
 def pick_video_suffix_from_format(fmt: dict) -> str:
@@ -80,6 +130,7 @@ def pick_video_suffix_from_format(fmt: dict) -> str:
 
 
 # ---------- Language Helpers ----------
+@lru_cache(maxsize=64)
 def lang_for_mux(norm_code: str) -> str:
     """Convert 'floor' → 'ina' and pass through others unchanged."""
     if norm_code == "floor":
@@ -87,25 +138,29 @@ def lang_for_mux(norm_code: str) -> str:
     return norm_code
 
 
-def load_languages(lang_file: str = None) -> dict:
+@lru_cache(maxsize=1)
+def load_languages(lang_file: str = None) -> MappingProxyType:
     """
     Load language codes from config/languages.json.
     Works for both dev and frozen builds (EXE).
     Falls back to built-in defaults if missing or invalid.
+    The result is cached and shared, so it is returned as a read-only mapping.
     """
     # Default lookup priority:
     # 1. Explicitly passed path
     # 2. config/ next to executable or project root
     # 3. _MEIPASS (PyInstaller temp folder)
     if lang_file is None:
-        if getattr(sys, "frozen", False):
-            # ✅ Use actual executable directory first
-            base_dir = Path(sys.executable).parent / "config"
-        else:
-            # ✅ Use project root during development
-            base_dir = Path(__file__).resolve().parent / "config"
-
-        lang_file = base_dir / "languages.json"
+        # CONFIG_DIR is already <exe dir>/config (frozen) or <project root>/config (dev)
+        lang_file = CONFIG_DIR / "languages.json"
+        # Frozen builds also carry the table as a module generated by the build
+        # spec; without an (editable) config copy, use it instead of parsing JSON
+        if _FROZEN and not lang_file.exists():
+            try:
+                from languages_frozen import LANGS
+                return MappingProxyType(LANGS)
+            except ImportError:
+                pass
 
     # Fallback: PyInstaller's unpacked directory (as a last resort)
     if not lang_file.exists() and getattr(sys, "_MEIPASS", None):
@@ -115,12 +170,12 @@ def load_languages(lang_file: str = None) -> dict:
         with open(lang_file, "r", encoding="utf-8") as f:
             data = json.load(f)
             if isinstance(data, dict):
-                return data
+                return MappingProxyType(data)
     except Exception as e:
         print(f"[load_languages] warning: {e}")
 
     # Final fallback
-    return {}
+    return MappingProxyType({})
 
 
 
@@ -133,49 +188,274 @@ DEFAULT_SETTINGS = {
         "demux": str(Path.cwd()),
     },
     "default_lang": "eng",
+    "ffprobe_timeout": 10.0,   # seconds per file (mux tab track detection)
 }
 
 
 # ---------- Settings Manager ----------
 class SettingsManager:
+    """
+    Settings persisted through QSettings (registry on Windows, plist on macOS,
+    INI elsewhere). `data` keeps the familiar nested dict shape as an in-memory
+    cache; QSettings is only read in load() and written in save()/sync().
+    """
     def __init__(self, filename: str = "settings.json"):
-        self.filename = Path(filename)
-        self.data = DEFAULT_SETTINGS.copy()
+        self.filename = Path(filename)  # legacy JSON, imported once if present
+        self._qs = QSettings()
+        self.data = copy.deepcopy(DEFAULT_SETTINGS)
+        self._policies: dict[str, str] = {}
+        self._out_dirs: dict[str, str] = {}
+        self._dirty = False
         self.load()
 
+    def _refresh_cache(self):
+        """Mirror the per-tab policy/output-dir values into flat dicts."""
+        self._policies = dict(self.data["overwrite_policy"])
+        self._out_dirs = dict(self.data["last_output_dir"])
+
+    @property
+    def dirty(self) -> bool:
+        """True if the cached settings differ from what was last saved."""
+        return self._dirty
+
+    def set_policy(self, key: str, value: str):
+        if self._policies.get(key) == value:
+            return
+        self.data["overwrite_policy"][key] = value
+        self._policies[key] = value
+        self._dirty = True
+
+    def set_out_dir(self, key: str, value: str):
+        if self._out_dirs.get(key) == value:
+            return
+        self.data["last_output_dir"][key] = value
+        self._out_dirs[key] = value
+        self._dirty = True
+
+    def reset_defaults(self):
+        """Replace the cached settings with defaults (persisted on next save)."""
+        self.data = copy.deepcopy(DEFAULT_SETTINGS)  # never alias the nested defaults
+        self._refresh_cache()
+        self._dirty = True
+
+    def _import_legacy_json(self):
+        """One-time migration of an old settings.json into QSettings."""
+        try:
+            # Read the whole file in one buffered call and parse from bytes
+            with open(self.filename, "rb", buffering=131072) as f:
+                legacy = json.loads(f.read())
+
+            # --- Migration from old configs ---
+            if "remux" in legacy.get("overwrite_policy", {}):
+                legacy["overwrite_policy"]["demux"] = legacy["overwrite_policy"].pop("remux")
+            if "remux" in legacy.get("last_output_dir", {}):
+                legacy["last_output_dir"]["demux"] = legacy["last_output_dir"].pop("remux")
+
+            for k, v in legacy.items():
+                if isinstance(v, dict):
+                    for kk, vv in v.items():
+                        self._qs.setValue(f"{k}/{kk}", vv)
+                else:
+                    self._qs.setValue(k, v)
+            self._qs.sync()
+        except Exception as e:
+            print(f"Failed to import legacy settings ({e}), using defaults.")
+
     def load(self):
-        """Load settings, or use defaults if missing/corrupt."""
-        if self.filename.exists():
-            try:
-                with open(self.filename, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-
-                # --- Migration from old configs ---
-                if "remux" in self.data.get("overwrite_policy", {}):
-                    self.data["overwrite_policy"]["demux"] = self.data["overwrite_policy"].pop("remux")
-                if "remux" in self.data.get("last_output_dir", {}):
-                    self.data["last_output_dir"]["demux"] = self.data["last_output_dir"].pop("remux")
-
-                # Fill defaults for missing keys
-                for k, v in DEFAULT_SETTINGS.items():
-                    if k not in self.data:
-                        self.data[k] = v
-                    elif isinstance(v, dict):
-                        for kk, vv in v.items():
-                            self.data[k].setdefault(kk, vv)
-            except Exception as e:
-                print(f"Failed to load settings ({e}), using defaults.")
-                self.data = DEFAULT_SETTINGS.copy()
-        else:
-            self.data = DEFAULT_SETTINGS.copy()
+        """Load settings, or use defaults for missing keys."""
+        qs = self._qs
+        if not qs.contains("overwrite_policy/download") and self.filename.exists():
+            self._import_legacy_json()
+
+        data = {}
+        for k, v in DEFAULT_SETTINGS.items():
+            if isinstance(v, dict):
+                data[k] = {kk: qs.value(f"{k}/{kk}", vv, type=str) for kk, vv in v.items()}
+            elif isinstance(v, str):
+                data[k] = qs.value(k, v, type=str)
+            else:
+                data[k] = qs.value(k, v)  # numeric; may come back as a string, readers parse it
+        self.data = data
+        self._refresh_cache()
+        self._dirty = False
 
     def save(self):
-        """Save settings safely."""
-        try:
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2)
-        except Exception as e:
-            print(f"Failed to save settings: {e}")
+        """Push changed settings into QSettings (flushed to disk by sync())."""
+        if not self._dirty:
+            return
+        qs = self._qs
+        for k, v in self.data.items():
+            if isinstance(v, dict):
+                for kk, vv in v.items():
+                    qs.setValue(f"{k}/{kk}", vv)
+            else:
+                qs.setValue(k, v)
+        self._dirty = False
+
+    def sync(self):
+        """Flush pending QSettings writes to the backing store."""
+        self._qs.sync()
+        if self._qs.status() != QSettings.NoError:
+            print(f"Failed to save settings: {self._qs.status()}")
+
+
+# ---------- Table Helpers ----------
+@contextmanager
+def batched_table_updates(table):
+    """Suspend repaints, sorting and item signals while filling a table."""
+    sorting = table.isSortingEnabled()
+    table.setSortingEnabled(False)
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield
+    finally:
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
+        table.setSortingEnabled(sorting)
+
+
+# ---------- TTL Cache ----------
+class TTLCache:
+    """
+    Small LRU cache whose entries expire ttl seconds after they were stored.
+    Expiry uses wall-clock time so entries can be saved and reloaded (to_dict/load).
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (stored_at, value), oldest first
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        if time.time() - entry[0] > self.ttl:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = (time.time(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def to_dict(self) -> dict:
+        now = time.time()
+        return {k: list(e) for k, e in self._data.items() if now - e[0] <= self.ttl}
+
+    def load(self, data: dict):
+        """Merge entries produced by to_dict(), dropping expired ones."""
+        now = time.time()
+        for k, (stored_at, value) in sorted(data.items(), key=lambda kv: kv[1][0]):
+            if now - stored_at <= self.ttl:
+                self._data[k] = (stored_at, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# ---------- Shared asyncio Loop ----------
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+def get_async_loop() -> asyncio.AbstractEventLoop:
+    """The app's one daemon event loop (format fetches, ffmpeg jobs), started on first use."""
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever,
+                             name="async-jobs", daemon=True).start()
+        return _async_loop
+
+
+# ---------- Cache Directory ----------
+def cache_dir() -> Path:
+    """
+    Per-user folder for runtime caches (QStandardPaths.CacheLocation).
+    Resolve it only after main() has set the organization/application names.
+    """
+    return Path(QStandardPaths.writableLocation(QStandardPaths.CacheLocation))
+
+
+# ---------- Persisted ffprobe Cache ----------
+# One file for the mux and demux tabs. They probe with different arguments (mux
+# caps -probesize/-analyzeduration), so keys start with the probe kind and each tab
+# only gets its own results back. mtime/size in the key make replaced files re-probe.
+# Read from cache_dir() on first use (the app names aren't set at import).
+_probe_cache = TTLCache(maxsize=512, ttl=30 * 86400)
+_probe_cache_lock = threading.Lock()  # probes run on thread pools
+_probe_cache_dirty = False
+_probe_cache_loaded = False
+
+def _probe_cache_key(kind: str, path: str) -> str:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return f"{kind}|{path}"
+    return f"{kind}|{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+
+def _load_probe_cache():
+    """Merge the saved cache in once; call with _probe_cache_lock held."""
+    global _probe_cache_loaded
+    if _probe_cache_loaded:
+        return
+    _probe_cache_loaded = True
+    try:
+        with open(cache_dir() / "ffprobe_cache.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            _probe_cache.load(data)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[ffprobe cache] warning: {e}")
+
+def cached_probe(kind: str, path: str):
+    """Return the cached ffprobe info of this kind for path, or None without running ffprobe."""
+    key = _probe_cache_key(kind, path)
+    with _probe_cache_lock:
+        _load_probe_cache()
+        return _probe_cache.get(key)
+
+def store_probe(kind: str, path: str, info: dict):
+    """Remember ffprobe info for path (written out by save_probe_cache)."""
+    global _probe_cache_dirty
+    key = _probe_cache_key(kind, path)
+    with _probe_cache_lock:
+        _load_probe_cache()
+        _probe_cache[key] = info
+        _probe_cache_dirty = True
+
+def save_probe_cache():
+    """Write the ffprobe cache to disk if anything new was probed."""
+    global _probe_cache_dirty
+    with _probe_cache_lock:
+        if not _probe_cache_dirty:
+            return
+        snapshot = _probe_cache.to_dict()
+        _probe_cache_dirty = False
+    try:
+        folder = cache_dir()
+        folder.mkdir(parents=True, exist_ok=True)
+        with open(folder / "ffprobe_cache.json", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+    except Exception as e:
+        print(f"[ffprobe cache] could not save: {e}")
 
 
 # ---------- Utility: Ensure Unique Path ----------
@@ -186,16 +466,26 @@ def ensure_unique_path(filepath: Path) -> Path:
         return filepath
     stem, suffix = filepath.stem, filepath.suffix
     parent = filepath.parent
+    # one directory listing, then probe candidates in memory instead of a stat each
+    try:
+        taken = {os.path.normcase(n) for n in os.listdir(parent)}
+    except OSError:
+        taken = None
+    prefix = os.path.join(parent, stem)
     i = 1
     while True:
-        new_path = parent / f"{stem} ({i}){suffix}"
-        if not new_path.exists():
-            return new_path
+        name = f"{stem} ({i}){suffix}"
+        if taken is not None:
+            if os.path.normcase(name) not in taken:
+                return parent / name
+        elif not os.path.exists(f"{prefix} ({i}){suffix}"):
+            return parent / name
         i += 1
 
 
 # ---------- Language Mapping ----------
-_LANGS_DEFAULT = {
+# Read-only views: these tables are shared by every lookup and never edited
+_LANGS_DEFAULT = MappingProxyType({
     "ara": "Arabic", "zho": "Chinese", "eng": "English", "fra": "French",
     "rus": "Russian", "spa": "Spanish", "ina": "Floor", "floor": "Floor",
     "ben": "Bangla", "deu": "German", "ell": "Greek", "hin": "Hindi",
@@ -203,37 +493,60 @@ _LANGS_DEFAULT = {
     "pol": "Polish", "por": "Portuguese", "fas": "Persian", "swa": "Kiswahili",
     "tur": "Turkish", "tuk": "Turkmen", "vie": "Vietnamese", "urd": "Urdu",
     "ukr": "Ukrainian", "aze": "Azerbaijani",
-}
+})
 
-_MAPPING_2TO3 = {
+_MAPPING_2TO3 = MappingProxyType({
     "ar": "ara", "zh": "zho", "en": "eng", "fr": "fra", "ru": "rus", "es": "spa",
     "bn": "ben", "de": "deu", "el": "ell", "hi": "hin", "id": "ind", "it": "ita",
     "ja": "jpn", "jp": "jpn", "ko": "kor", "pl": "pol", "pt": "por", "fa": "fas",
     "sw": "swa", "tr": "tur", "tk": "tuk", "vi": "vie", "ur": "urd",
     "uk": "ukr", "az": "aze",
-}
+})
+
+@lru_cache(maxsize=1)
+def _langs_639_2() -> dict:
+    """Built-in languages merged with languages.json, built on first use."""
+    return {**_LANGS_DEFAULT, **load_languages()}
+
+
+def __getattr__(name):
+    # PEP 562: `utils.LANGS_639_2` / `from utils import LANGS_639_2` reads
+    # languages.json only when something actually asks for the table
+    if name == "LANGS_639_2":
+        return _langs_639_2()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-LANGS_639_2 = {**_LANGS_DEFAULT, **load_languages()}
+_FLOOR_CODES = frozenset(("ia", "ina"))
+_LANG_SEP_RE = re.compile(r'[_\-.]([a-z]{2,3})(?=[_\-.])')
+# Answers for every plain (separator-free) code the branches below know about,
+# in the same precedence: floor codes, then 2->3 mapping, then built-in 3-letter codes
+_NORM_MAP = MappingProxyType({**{k: k for k in _LANGS_DEFAULT}, **_MAPPING_2TO3,
+                              **{k: "floor" for k in _FLOOR_CODES}})
 
 
+@lru_cache(maxsize=256)  # the same few tags recur on every track of a batch
 def normalize_lang_code(code: str, fallback: str = "eng") -> str:
     """Normalize language codes (e.g. en-us -> eng, jp -> jpn, ia -> floor)."""
     if not code:
         return fallback
     code = code.strip().lower()
-    if code in ("ia", "ina"):
-        return "floor"
-    match = re.search(r'[_\-\.]([a-z]{2,3})(?=[_\-\.])', code)
+    norm = _NORM_MAP.get(code)
+    if norm is not None:
+        return norm
+    # locale-style tags ("en-us", "x_fr_y") and codes only in languages.json
+    get_3 = _MAPPING_2TO3.get
+    match = _LANG_SEP_RE.search(code)
     if match:
         short = match.group(1)
-        if short in ("ia", "ina"):
+        if short in _FLOOR_CODES:
             return "floor"
-        return _MAPPING_2TO3.get(short, fallback)
+        return get_3(short, fallback)
     if code in _MAPPING_2TO3:
         return _MAPPING_2TO3[code]
     if "-" in code:
         base = code.split("-")[0]
-        return _MAPPING_2TO3.get(base, fallback)
-    if code in LANGS_639_2:
+        return get_3(base, fallback)
+    if code in _langs_639_2():
         return code
     return fallback
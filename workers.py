@@ -1,11 +1,43 @@
 # workers.py
-import subprocess
-import re
-from PySide6.QtCore import QThread, Signal
+import asyncio
+from PySide6.QtCore import QObject, Signal
+from utils import no_console_flags, get_async_loop
 
 
-class FfmpegWorker(QThread):
-    progress = Signal(float)   # Emits progress in %
+def _last_time(buf: bytes):
+    """
+    Latest complete "time=HH:MM:SS.ss" value in buf, in seconds, and the offset
+    just past it; (None, 0) if there is none. Plain bytes.find/rfind, no regex:
+    ffmpeg status lines look like "frame= ... time=00:01:02.50 bitrate=...".
+    """
+    idx = buf.rfind(b"time=")
+    while idx != -1:
+        end = buf.find(b" ", idx + 5)
+        if end != -1:
+            b = buf[idx + 5:end]
+            # usual "HH:MM:SS.ff": plain digit arithmetic on the bytes
+            if len(b) == 11 and b[2] == 58 and b[5] == 58 and b[8] == 46 and b[0] != 45:  # ':' ':' '.', not '-'
+                return ((b[0] - 48) * 36000 + (b[1] - 48) * 3600
+                        + (b[3] - 48) * 600 + (b[4] - 48) * 60
+                        + (b[6] - 48) * 10 + (b[7] - 48)
+                        + (b[9] - 48) * 0.1 + (b[10] - 48) * 0.01), end
+            parts = b.split(b":")
+            if len(parts) == 3:
+                try:
+                    return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2]), end
+                except ValueError:  # "time=N/A"
+                    pass
+        idx = buf.rfind(b"time=", 0, idx)
+    return None, 0
+
+class FfmpegWorker(QObject):
+    """
+    Runs one ffmpeg command as a coroutine on the app's shared event loop instead of
+    a thread of its own. While it runs, the current percentage is kept in
+    progress_pct for the GUI to poll; the progress signal fires once, with
+    100.0, when ffmpeg succeeds.
+    """
+    progress = Signal(float)   # Emits 100.0 on success
     finished = Signal(str)     # Emits the output file path when done
     error = Signal(str)        # Emits an error message if ffmpeg fails
 
@@ -16,43 +48,75 @@ class FfmpegWorker(QThread):
         self.duration = duration
         self._running = True
         self._proc = None
+        self._future = None
+        self.progress_pct = 0      # written on the event loop, polled from the GUI thread
+
+    def start(self):
+        self._future = asyncio.run_coroutine_threadsafe(self._run(), get_async_loop())
 
-    def run(self):
+    async def _run(self):
         try:
-            self._proc = subprocess.Popen(
-                self.cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                universal_newlines=True,
-                bufsize=1
+            self._proc = proc = await asyncio.create_subprocess_exec(
+                *self.cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                limit=65536,
+                **no_console_flags(),
             )
 
-            for line in self._proc.stderr:
+            # Binary stderr scanned chunk by chunk: only the newest time= in each
+            # chunk matters, and nothing is decoded or split into lines.
+            # A short tail is carried over in case a token straddles two reads.
+            duration = self.duration
+            read = proc.stderr.read
+            rest = b""
+            while True:
                 if not self._running:
-                    self._proc.terminate()
+                    self._terminate()
+                    break
+                chunk = await read(65536)
+                if not chunk:
                     break
 
-                if "time=" in line and self.duration > 0:
-                    match = re.search(r"time=(\d+):(\d+):(\d+\.\d+)", line)
-                    if match:
-                        h, m, s = match.groups()
-                        sec = int(h) * 3600 + int(m) * 60 + float(s)
-                        progress = min(100.0, sec / self.duration * 100)
-                        self.progress.emit(progress)
+                buf = rest + chunk
+                sec, end = _last_time(buf) if duration > 0 else (None, 0)
+                if sec is not None:
+                    # a plain attribute store: no queued signal per update
+                    self.progress_pct = int(min(100.0, sec / duration * 100))
+                rest = buf[end:][-64:]
 
-            self._proc.wait()
+            await proc.wait()
 
-            if self._proc.returncode == 0:
+            if proc.returncode == 0:
+                self.progress_pct = 100
                 self.progress.emit(100.0)
                 self.finished.emit(self.outfile)
             else:
-                self.error.emit(f"ffmpeg failed with code {self._proc.returncode}")
+                self.error.emit(f"ffmpeg failed with code {proc.returncode}")
 
         except Exception as e:
             self.error.emit(f"Worker error: {e}")
 
+    def _terminate(self):
+        proc = self._proc
+        if proc is not None and proc.returncode is None:
+            try:
+                proc.terminate()
+            except ProcessLookupError:
+                pass
+
     def stop(self):
         self._running = False
-        if self._proc and self._proc.poll() is None:
-            self._proc.terminate()
+        if self._future is not None:
+            # asyncio processes aren't thread-safe: signal from the loop itself
+            get_async_loop().call_soon_threadsafe(self._terminate)
+
+    def wait(self, timeout_ms: int = 3000) -> bool:
+        """Block until the job's coroutine has finished (bounded); True if it did."""
+        if self._future is None:
+            return True
+        try:
+            self._future.result(timeout_ms / 1000)
+        except Exception:
+            pass
+        return self._future.done()